@@ -22,12 +22,13 @@
 #     along with this program.  If not, see <http://www.gnu.org/licenses/>.
 # """
 # System modules
+import sys
+import importlib
 
 # External modules
 
 # Internal modules
 from pymepps.grid import GridBuilder
-from pymepps.loader import open_model_dataset, open_station_dataset
 from pymepps.accessor.pandas import PandasAccessor
 from pymepps.accessor.spatial import SpatialAccessor
 from pymepps.accessor.utilities import register_dataframe_accessor
@@ -37,4 +38,28 @@
            'PandasAccessor', 'SpatialAccessor', 'register_dataframe_accessor',
            'register_series_accessor']
 
+# The loaders need the file handler backends (e.g. pygrib and the cdos), which
+# are only imported if a loader is used for the first time.
+_lazy_attributes = {
+    'open_model_dataset': 'pymepps.loader',
+    'open_station_dataset': 'pymepps.loader',
+}
+
+
+if sys.version_info >= (3, 7):
+    def __getattr__(name):
+        try:
+            module = importlib.import_module(_lazy_attributes[name])
+        except KeyError:
+            raise AttributeError(
+                'module {0:s} has no attribute {1:s}'.format(__name__, name))
+        attr = getattr(module, name)
+        globals()[name] = attr
+        return attr
+
+    def __dir__():
+        return sorted(set(globals().keys()) | set(_lazy_attributes.keys()))
+else:
+    from pymepps.loader import open_model_dataset, open_station_dataset
+
 __version__ = '0.4.0'
@@ -0,0 +1,80 @@
+#!/bin/env python
+# -*- coding: utf-8 -*-
+#
+#Created on 14.10.26
+#
+#Created for pymepps
+#
+#@author: Tobias Sebastian Finn, tobias.sebastian.finn@studium.uni-hamburg.de
+#
+#    Copyright (C) {2026}  {Tobias Sebastian Finn}
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+"""
+Numba-compiled kernels to merge DataArrays. This module needs numba and raises
+an ImportError if numba is not installed.
+"""
+
+# System modules
+import logging
+
+# External modules
+from numba import njit, prange, typed, config
+
+# Internal modules
+
+
+logger = logging.getLogger(__name__)
+
+# The parallel kernel only pays off for enough messages and more than one
+# thread, because the memory copy of a message is already fast in numpy.
+MIN_MESSAGES = 32
+
+
+@njit(parallel=True, cache=True)
+def _scatter_kernel(out, slots, tiles):
+    for n in prange(slots.shape[0]):
+        tile = tiles[n]
+        out_tile = out[slots[n]]
+        for i in range(tile.size):
+            out_tile[i] = tile[i]
+
+
+def use_kernel(messages):
+    """
+    Check if the parallel kernel should be used for the given number of
+    messages.
+    """
+    return config.NUMBA_NUM_THREADS > 1 and messages >= MIN_MESSAGES
+
+
+def scatter_messages(out, slots, tiles):
+    """
+    Write the given message tiles in parallel into the given slots of the
+    output array.
+
+    Parameters
+    ----------
+    out : numpy.ndarray
+        The output array with the shape (slots, tile size). The tiles are
+        written into this array.
+    slots : numpy.ndarray(int)
+        The slot within the output array for every tile. Every slot should
+        be only given once.
+    tiles : list(numpy.ndarray)
+        The flattened and C-contiguous tiles with the same dtype as the output
+        array.
+    """
+    _scatter_kernel(out, slots, typed.List(tiles))
@@ -53,9 +53,14 @@ def __init__(self, data):
 
     def update(self, *items):
         """
-        Update the data.
+        Update the data. The items are concatenated along the index in a
+        single step. Duplicated index values are resolved in favour of the
+        newest item, where missing values are filled with the values of older
+        items. If the index values of all items are unique, the concatenated
+        data is only sorted. Series are used as columns named after the series
+        name or after their position if they have no name.
         """
-        update_data = [self.data.copy(), ]
+        update_data = [self.data, ]
         for item in items:
             if isinstance(item, (pd.Series, pd.DataFrame)):
                 update_data.append(item)
@@ -63,16 +68,20 @@ def update(self, *items):
                 raise TypeError(
                     'The given item {0} need to be in a pandas conform data '
                     'type!'.format(item))
-        concatenated_data = pd.concat(update_data, axis=1)
-        dup_cols = concatenated_data.columns.duplicated(keep='last')
-        columned_data = concatenated_data.loc[:, ~dup_cols].sort_index(axis=1)
-        for name, val in concatenated_data.loc[:, dup_cols][::-1].iteritems():
-            columned_data[name] = columned_data[name].fillna(val)
-        columned_data = columned_data.squeeze()
-        dup_rows = columned_data.index.duplicated(keep='last')
-        updated_array = columned_data.loc[~dup_rows].sort_index(axis=0)
-        for ind, val in concatenated_data.loc[dup_rows][::-1].T.iteritems():
-            updated_array.loc[ind] = updated_array.loc[ind].fillna(val)
+        update_data = [
+            d.to_frame(name=k if d.name is None else d.name)
+            if isinstance(d, pd.Series) else d
+            for k, d in enumerate(update_data)]
+        concatenated_data = pd.concat(update_data, axis=0, sort=False,
+                                      copy=False)
+        if concatenated_data.index.is_unique:
+            # Disjoint items need no resolving of duplicated index values
+            updated_array = concatenated_data.sort_index()
+        else:
+            levels = list(range(concatenated_data.index.nlevels))
+            updated_array = concatenated_data.groupby(
+                level=levels, sort=True, dropna=False).last()
+        updated_array = updated_array.sort_index(axis=1).squeeze(axis=1)
         updated_array.pp.lonlat = self.lonlat
         return updated_array
 
@@ -27,10 +27,25 @@
 from collections import OrderedDict
 import re
 import datetime
+import atexit
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 # External modules
 import xarray as xr
 import numpy as np
+import pandas as pd
+
+try:
+    import zarr
+    import numcodecs
+except ImportError:
+    zarr = None
+    numcodecs = None
+try:
+    import dask.array as da
+except ImportError:
+    da = None
 
 # Internal modules
 import pymepps
@@ -38,6 +53,11 @@
 from pymepps.grid.builder import GridBuilder
 from pymepps.loader.datasets.tsdataset import TSDataset
 from pymepps.loader.filehandler.netcdfhandler import cube_to_series
+try:
+    from ._merge_numba import scatter_messages, use_kernel
+except ImportError:
+    scatter_messages = None
+    use_kernel = None
 
 
 logger = logging.getLogger(__name__)
@@ -297,11 +317,15 @@ def _transform_datetime(data):
         transformed_data : xr.DataArray
             The DataArray with the transformed time coordinates.
         """
-        transformed_data = data.copy()
         dims_to_transform = [
             dim for dim in data.dims
             if isinstance(data[dim].values[0],
-                          (datetime.datetime, np.datetime64))]
+                          (datetime.datetime, np.datetime64))
+            and data[dim].dtype != 'datetime64[ns]']
+        if not dims_to_transform:
+            return data
+        # Only the coordinates are replaced, such that the values are shared
+        transformed_data = data.copy(deep=False)
         for dim in dims_to_transform:
             transformed_data[dim] = transformed_data[dim].astype(
                 'datetime64[ns]')
@@ -382,12 +406,13 @@ def _validtime_to_timedelta(data, validtime='validtime', runtime='runtime'):
         transformed_array : xr.DataArray
             The DataArray with the transformed validtime coordinate.
         """
-        transformed_array = data.copy()
         runtime_values = data[runtime].values
         validtime_values = data[validtime].values
-        if np.issubdtype(runtime_values.dtype, np.datetime64) and \
-                np.issubdtype(validtime_values.dtype, np.datetime64):
-            transformed_array[validtime] = validtime_values - runtime_values
+        if not (np.issubdtype(runtime_values.dtype, np.datetime64) and
+                np.issubdtype(validtime_values.dtype, np.datetime64)):
+            return data
+        transformed_array = data.copy(deep=False)
+        transformed_array[validtime] = validtime_values - runtime_values
         return transformed_array
 
     def merge(self, *items):
@@ -426,6 +451,13 @@ def update(self, *items):
             data. Such that intersection problems are resolved in favor of the
             newest data.
 
+        The non-grid coordinates of all items are merged into sorted indexes,
+        where the position of every item within these merged indexes is
+        calculated in the same sorting step. The data is then directly written
+        into a pre-allocated array. Missing values are filled with NaN. If
+        every item is a dask-backed single message and every position is
+        filled exactly once, the messages are lazily concatenated instead.
+
         Parameters
         ----------
         items : xarray.DataArray
@@ -439,25 +471,240 @@ def update(self, *items):
         """
         update_data = [self.check_data_coordinates(self.data), ]
         update_data += [self.check_data_coordinates(item) for item in items]
-        stack_dims = [dim for dim in self.data.dims
-                      if dim not in self.grid.get_coord_names()]
+        grid_dims = self.data.dims[-self.grid.len_coords:]
+        stack_dims = self.data.dims[:-self.grid.len_coords]
         logger.debug('Stack dimension names: {0}'.format(stack_dims))
-        stacked_data = (d.stack(merge=stack_dims) for d in update_data)
         try:
-            concated_array = xr.concat(stacked_data, dim='merge')
+            update_data = [d if d.dims == self.data.dims
+                           else d.transpose(*self.data.dims)
+                           for d in update_data]
+            merged_indexes, item_positions = self._merge_indexes(
+                update_data, stack_dims)
         except (ValueError, TypeError) as e:
             raise e.__class__("The concatenation doesn't working, for "
                               'please see above for the reasons!')
-        resolving_indexes = ~concated_array.indexes['merge'].duplicated(
-            keep='last')
+        filled, write_items = self._resolve_items(
+            item_positions, [len(merged_indexes[dim]) for dim in stack_dims])
         logger.debug('Number of resolving indexes: {0:d}/{1:d}'.format(
-            len(resolving_indexes), len(concated_array.indexes['merge'])))
-        resolved_array = concated_array[..., resolving_indexes]
-        unstacked_array = resolved_array.unstack('merge')
-        updated_array = unstacked_array.transpose(*self.data.dims)
+            int(np.sum(filled)), filled.size))
+        updated_dtype = np.result_type(*[d.dtype for d in update_data])
+        updated_shape = filled.shape+self.data.shape[-self.grid.len_coords:]
+        all_filled = bool(np.all(filled))
+        lazy_combine = da is not None and all_filled and \
+            len(write_items) == len(update_data) and \
+            self._single_messages(item_positions, filled.shape) and \
+            all(d.chunks is not None for d in update_data)
+        if lazy_combine:
+            updated_values = self._combine_lazy(
+                update_data, item_positions, filled.shape)
+        else:
+            if not all_filled:
+                updated_dtype = np.result_type(updated_dtype, np.float32)
+            updated_values = np.empty(updated_shape, dtype=updated_dtype)
+            if not all_filled:
+                # Only the missing messages are filled, the rest is overwritten
+                updated_values[~filled] = np.nan
+            self._scatter_items(updated_values, filled.shape, update_data,
+                                item_positions, write_items)
+        updated_coords = OrderedDict(
+            (dim, merged_indexes[dim]) for dim in stack_dims)
+        for name, coord in self.data.coords.items():
+            if name not in updated_coords and set(coord.dims) <= set(grid_dims):
+                updated_coords[name] = coord.variable
+        updated_array = xr.DataArray(
+            updated_values,
+            coords=updated_coords,
+            dims=self.data.dims,
+            name=self.data.name,
+            attrs=self.data.attrs
+        )
         updated_array.pp.grid = self.grid
         return updated_array
 
+    @staticmethod
+    def _merge_indexes(data, dims):
+        """
+        Merge the coordinate values of the given dimensions of all data items
+        into sorted indexes without duplicates. The coordinate values of all
+        items are concatenated and sorted within a single numpy.unique call,
+        which also returns the positions of the items within the merged
+        indexes. Unorderable coordinate values are merged in order of their
+        appearance.
+
+        Parameters
+        ----------
+        data : list(xarray.DataArray)
+            The data items with the given dimensions.
+        dims : iterable(str)
+            The names of the dimensions, which should be merged.
+
+        Returns
+        -------
+        merged_indexes : OrderedDict(str, pandas.Index)
+            The merged index for every given dimension.
+        item_positions : list(list(numpy.ndarray))
+            The positions of the coordinate values within the merged indexes.
+            There is one list for every item with one array for every given
+            dimension.
+
+        Raises
+        ------
+        TypeError
+            A TypeError is raised if an item has no coordinate values for a
+            dimension or if the coordinate values have incompatible types.
+        """
+        merged_indexes = OrderedDict()
+        item_positions = [[] for _ in data]
+        # The indexes property creates a new mapping on every access
+        item_indexes = [d.indexes for d in data]
+        for dim in dims:
+            if not all(dim in indexes for indexes in item_indexes):
+                raise TypeError('The dimension {0:s} has no coordinate '
+                                'values for all items!'.format(dim))
+            item_values = [indexes[dim].values for indexes in item_indexes]
+            # Raises a TypeError for incompatible coordinate types
+            np.result_type(*[values.dtype for values in item_values])
+            item_lengths = [len(values) for values in item_values]
+            coord_values = np.concatenate(item_values)
+            try:
+                merged_values, positions = np.unique(coord_values,
+                                                     return_inverse=True)
+            except TypeError:
+                positions, merged_values = pd.factorize(coord_values)
+                # Missing values like None are kept as own coordinate value
+                missing = positions < 0
+                if np.any(missing):
+                    positions[missing] = len(merged_values)
+                    merged_values = np.append(
+                        np.asarray(merged_values, dtype=object),
+                        coord_values[missing][:1])
+            merged_indexes[dim] = pd.Index(merged_values, name=dim)
+            if len(set(item_lengths)) == 1:
+                # Items with the same length, e.g. single messages, are views
+                split_positions = positions.reshape(len(data), -1)
+            else:
+                split_positions = np.split(positions,
+                                           np.cumsum(item_lengths)[:-1])
+            for k, item_pos in enumerate(split_positions):
+                item_positions[k].append(item_pos)
+        return merged_indexes, item_positions
+
+    @staticmethod
+    def _resolve_items(item_positions, shape):
+        """
+        Resolve which items have to be written into the merged array and which
+        values of the merged array are filled by the items. If every item is a
+        single message, its positions are packed into a single linear index,
+        such that items, which are overwritten by newer items, are found with
+        one numpy.unique call and skipped.
+
+        Parameters
+        ----------
+        item_positions : list(list(numpy.ndarray))
+            The positions of the items within the merged indexes.
+        shape : list(int)
+            The shape of the merged indexes.
+
+        Returns
+        -------
+        filled : numpy.ndarray(bool)
+            The mask of the merged indexes, which are filled by the items.
+        write_items : list(int)
+            The numbers of the items, which have to be written in this order.
+        """
+        filled = np.zeros(shape, dtype=bool)
+        if SpatialAccessor._single_messages(item_positions, shape):
+            packed = np.ravel_multi_index(
+                [np.concatenate(dim_positions)
+                 for dim_positions in zip(*item_positions)], shape)
+            # The newest item of every position is kept
+            _, last_items = np.unique(packed[::-1], return_index=True)
+            write_items = sorted(len(packed)-1-last_items)
+            filled.flat[packed] = True
+        else:
+            write_items = list(range(len(item_positions)))
+            for positions in item_positions:
+                filled[np.ix_(*positions)] = True
+        return filled, write_items
+
+    @staticmethod
+    def _single_messages(item_positions, shape):
+        return len(shape) > 0 and all(
+            len(pos) == 1 for positions in item_positions for pos in positions)
+
+    @staticmethod
+    def _combine_lazy(update_data, item_positions, shape):
+        """
+        Combine dask-backed single messages, which fill every position of the
+        merged indexes exactly once, into a single dask array. The messages
+        are sorted into a nested grid and concatenated along the merged
+        dimensions, such that the data is not loaded.
+        """
+        nested = np.empty(shape, dtype=object)
+        for k, positions in enumerate(item_positions):
+            nested[tuple(pos[0] for pos in positions)] = update_data[k].data
+
+        def concatenate_nested(sub_nested, axis):
+            if sub_nested.ndim == 1:
+                return da.concatenate(list(sub_nested), axis=axis)
+            return da.concatenate(
+                [concatenate_nested(sub, axis+1) for sub in sub_nested],
+                axis=axis)
+
+        return concatenate_nested(nested, 0)
+
+    def _scatter_items(self, updated_values, shape, update_data,
+                       item_positions, write_items):
+        """
+        Write the data of the given items into the merged array. If numba is
+        installed with more than one thread and there are many single
+        messages, the messages are written in parallel by a compiled kernel.
+        Else the items are written one after another.
+        """
+        if scatter_messages is not None and \
+                self._single_messages(item_positions, shape) and \
+                use_kernel(len(write_items)) and \
+                updated_values.dtype.kind in 'biufc':
+            slots = np.ravel_multi_index(
+                [np.concatenate([item_positions[k][d] for k in write_items])
+                 for d in range(len(shape))], shape)
+            tiles = [np.ascontiguousarray(
+                update_data[k].values, dtype=updated_values.dtype).reshape(-1)
+                     for k in write_items]
+            scatter_messages(
+                updated_values.reshape(int(np.prod(shape)), -1), slots, tiles)
+        else:
+            for k in write_items:
+                index = self._positions_to_index(item_positions[k])
+                updated_values[index] = update_data[k].values
+
+    @staticmethod
+    def _positions_to_index(positions):
+        """
+        Convert the positions of an item within the merged indexes into an
+        index for the merged array. If the positions are contiguous in every
+        dimension, e.g. for single messages, the index consists of slices such
+        that the item is written with basic indexing. Else an open mesh is
+        returned.
+
+        Parameters
+        ----------
+        positions : list(numpy.ndarray)
+            The positions of the item with one array for every dimension.
+
+        Returns
+        -------
+        index : tuple
+            The index of the item within the merged array.
+        """
+        slices = []
+        for pos in positions:
+            start = pos[0] if len(pos) else 0
+            if not np.array_equal(pos, np.arange(start, start+len(pos))):
+                return np.ix_(*positions)
+            slices.append(slice(start, start+len(pos)))
+        return tuple(slices)
+
     def merge_analysis_timedelta(self, analysis_axis='runtime',
                                  timedelta_axis='validtime'):
         """
@@ -643,28 +890,105 @@ def grid_to_attrs(self):
         grid_array.attrs.update(grid_attr)
         return grid_array
 
-    def save(self, save_path):
+    def save(self, save_path, chunks=None, complevel=4, asynchronous=False):
         """
         Save the DataArray and the grid as attributes together. The grid
         attributes are used by the load method to recreate the grid, but it is
         also possible to load the data with the normal xarray load functions.
 
+        The data is saved as compressed and chunked NetCDF4 variable. The
+        chunks span the whole time axis, such that time series at single
+        grid points can be read without reading the whole file. The chunks
+        are limited to around 100 MB by shrinking the grid dimensions. If the
+        save path ends with .zarr, the data is saved as Zarr store with the
+        same chunks and a zstd-compressed Blosc compressor, such that every
+        chunk could be read independently.
+
         Parameters
         ----------
         save_path : str
-            The path where the netcdf file should be saved.
+            The path where the netcdf file or the zarr store should be saved.
+        chunks : tuple(int), dict(str, int), bool or None, optional
+            The chunk sizes of the saved variable. A tuple has to specify the
+            chunk size for every dimension, while a dict could specify the
+            chunk sizes of some dimensions by name. The unspecified
+            dimensions are calculated. If this is False, the data is saved
+            without chunking and compression. If this is None, the chunk sizes
+            are calculated. Default is None.
+        complevel : int, optional
+            The compression level of the saved variable. Default is 4.
+        asynchronous : bool, optional
+            If the data should be written by a background thread. The data is
+            copied before it is written, such that it could be changed while
+            it is written. At most one asynchronous save is written at the
+            same time, a further save waits until the previous save is
+            written. All pending saves are written before the interpreter
+            exits. Default is False.
+
+        Returns
+        -------
+        future : concurrent.futures.Future or None
+            If asynchronous is True, the future of the background write is
+            returned. Errors of the write are raised by its result method.
+            Else None is returned.
         """
         try:
             save_array = self.grid_to_attrs()
         except TypeError:
             save_array = self.data.copy()
-        save_array.to_netcdf(save_path)
+        if self.data.name is None or self.data.name in self.data.coords or \
+                self.data.name in self.data.dims:
+            var_name = xr.backends.api.DATAARRAY_VARIABLE
+        else:
+            var_name = self.data.name
+        save_zarr = _is_zarr_path(save_path)
+        if chunks is False or save_array.dtype.kind not in 'biufc' or \
+                not all(save_array.shape):
+            if save_zarr:
+                return _write(
+                    asynchronous, save_array.to_dataset(name=var_name).to_zarr,
+                    save_path, mode='w')
+            return _write(asynchronous, save_array.to_netcdf, save_path)
+        if isinstance(chunks, (tuple, list)):
+            chunksizes = tuple(chunks)
+        else:
+            try:
+                spatial_dims = self.grid.len_coords
+            except (AttributeError, TypeError, ValueError):
+                spatial_dims = 2
+            chunksizes = _calc_chunks(
+                save_array.shape, save_array.dims, save_array.dtype.itemsize,
+                spatial_dims=spatial_dims, fixed_chunks=chunks)
+        var_encoding = {key: val for key, val in save_array.encoding.items()
+                        if key in ('dtype', '_FillValue', 'scale_factor',
+                                   'add_offset')}
+        if save_zarr:
+            if zarr is None:
+                raise ImportError('To save the data as zarr store, the zarr '
+                                  'and numcodecs packages are needed!')
+            if save_array.chunks is not None:
+                save_array = save_array.chunk(
+                    dict(zip(save_array.dims, chunksizes)))
+            var_encoding.update(chunks=chunksizes,
+                                **_zarr_compression(complevel))
+            return _write(
+                asynchronous, save_array.to_dataset(name=var_name).to_zarr,
+                save_path, mode='w', encoding={var_name: var_encoding})
+        else:
+            var_encoding.update(
+                chunksizes=chunksizes, zlib=complevel > 0,
+                complevel=complevel)
+            return _write(
+                asynchronous, save_array.to_netcdf, save_path,
+                engine='netcdf4', encoding={var_name: var_encoding})
 
     @staticmethod
     def load(load_path):
         """
-        Load a NetCDF-based previously saved xarray.DataArray instance. If the
-        NetCDF file has grid attributes they will be decoded as new grid.
+        Load a NetCDF-based or Zarr-based previously saved xarray.DataArray
+        instance. A Zarr store is detected by the .zarr extension and lazily
+        opened. If the file has grid attributes they will be decoded as new
+        grid.
 
         Parameters
         ----------
@@ -677,7 +1001,16 @@ def load(load_path):
             The loaded DataArray instance. If a grid could be created it will be
             set to the DataArray instance.
         """
-        loaded_array = xr.open_dataarray(load_path)
+        if _is_zarr_path(load_path):
+            loaded_ds = xr.open_zarr(load_path)
+            if len(loaded_ds.data_vars) != 1:
+                raise ValueError('The given zarr store contains more than one '
+                                 'data variable!')
+            loaded_array = next(iter(loaded_ds.data_vars.values()))
+            if loaded_array.name == xr.backends.api.DATAARRAY_VARIABLE:
+                loaded_array.name = None
+        else:
+            loaded_array = xr.open_dataarray(load_path)
         grid_attrs = [attr for attr in loaded_array.attrs
                       if attr[:7] == 'ppgrid_']
         grid_dict = {attr[7:]: loaded_array.attrs[attr] for attr in grid_attrs}
@@ -689,3 +1022,142 @@ def load(load_path):
         except (KeyError, ValueError):
             pass
         return loaded_array
+
+
+class _BackgroundWriter(object):
+    """
+    Single background thread, which writes the asynchronous saves one after
+    another. A new save waits until the previous save is written, such that
+    there is at most one written and one prepared copy of the data. Failed
+    saves are logged.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._executor = None
+        self._pending = None
+
+    def submit(self, write_func, *args, **kwargs):
+        with self._lock:
+            self._wait()
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1)
+            self._pending = self._executor.submit(write_func, *args, **kwargs)
+            self._pending.add_done_callback(self._log_error)
+            return self._pending
+
+    @staticmethod
+    def _log_error(future):
+        if not future.cancelled() and future.exception() is not None:
+            logger.error('The data could not be saved: {0:s}'.format(
+                str(future.exception())))
+
+    def _wait(self):
+        if self._pending is not None:
+            self._pending.exception()
+            self._pending = None
+
+    def wait(self):
+        """
+        Wait until the pending save is written. Errors of the save are not
+        raised, but could be retrieved from the future of the save.
+        """
+        with self._lock:
+            self._wait()
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+            self._pending = None
+
+
+background_writer = _BackgroundWriter()
+atexit.register(background_writer.shutdown)
+
+
+def _write(asynchronous, write_func, *args, **kwargs):
+    if asynchronous:
+        return background_writer.submit(write_func, *args, **kwargs)
+    write_func(*args, **kwargs)
+
+
+def _is_zarr_path(path):
+    return str(path).rstrip('/\\').endswith('.zarr')
+
+
+def _zarr_compression(complevel):
+    """
+    Get the zarr encoding of a zstd compressed variable with the given
+    compression level. Zarr 3 expects a tuple of codecs as compressors,
+    while older zarr versions expect a single numcodecs compressor.
+    """
+    if int(zarr.__version__.split('.')[0]) >= 3:
+        return dict(compressors=(zarr.codecs.BloscCodec(
+            cname='zstd', clevel=complevel, shuffle='shuffle'), ))
+    return dict(compressor=numcodecs.Blosc(
+        cname='zstd', clevel=complevel, shuffle=numcodecs.Blosc.SHUFFLE))
+
+
+def _calc_chunks(shape, dims, itemsize, target_bytes=100*2**20,
+                 prefer_dim=None, spatial_dims=2, fixed_chunks=None):
+    """
+    Calculate the chunk sizes for a NetCDF4 variable with a bias towards long
+    time series. The whole extent of the time dimension is allocated to a
+    chunk and all other non-grid dimensions get a chunk size of one. Then the
+    largest grid dimension is halved until the chunk fits into the target
+    size. If the chunk is still too large, the time dimension is shrinked.
+
+    Parameters
+    ----------
+    shape : tuple(int)
+        The shape of the variable.
+    dims : tuple(str)
+        The dimension names of the variable.
+    itemsize : int
+        The size of one element of the variable in bytes.
+    target_bytes : int, optional
+        The maximum size of one chunk in bytes. Default is 100 MB.
+    prefer_dim : str or None, optional
+        The whole extent of this dimension is allocated to a chunk. If this is
+        None, validtime or time is used if they are dimensions of the variable.
+        Default is None.
+    spatial_dims : int, optional
+        The number of grid dimensions, which are the last dimensions of the
+        variable. Default is 2.
+    fixed_chunks : dict(str, int) or None, optional
+        These chunk sizes are used for the given dimensions instead of the
+        calculated chunk sizes. Default is None.
+
+    Returns
+    -------
+    chunks : tuple(int)
+        The chunk size for every dimension.
+    """
+    if prefer_dim is None:
+        prefer_dim = next((dim for dim in ('validtime', 'time')
+                           if dim in dims), None)
+    if fixed_chunks is None:
+        fixed_chunks = {}
+    spatial_axes = list(range(len(shape)-spatial_dims, len(shape)))
+    chunks = [1] * len(shape)
+    for axis in spatial_axes:
+        chunks[axis] = shape[axis]
+    if prefer_dim in dims:
+        chunks[dims.index(prefer_dim)] = shape[dims.index(prefer_dim)]
+    for dim, size in fixed_chunks.items():
+        if dim in dims:
+            chunks[dims.index(dim)] = max(min(size, shape[dims.index(dim)]), 1)
+    free_spatial = [axis for axis in spatial_axes
+                    if dims[axis] not in fixed_chunks]
+    free_time = [dims.index(dim) for dim in (prefer_dim, )
+                 if dim in dims and dim not in fixed_chunks]
+    max_elements = max(target_bytes // itemsize, 1)
+    for axes in (free_spatial, free_time):
+        while np.prod(chunks) > max_elements:
+            shrinkable = [axis for axis in axes if chunks[axis] > 1]
+            if not shrinkable:
+                break
+            largest = max(shrinkable, key=lambda axis: chunks[axis])
+            chunks[largest] = int(np.ceil(chunks[largest]/2))
+    return tuple(chunks)
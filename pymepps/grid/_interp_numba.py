@@ -0,0 +1,104 @@
+#!/bin/env python
+# -*- coding: utf-8 -*-
+#
+#Created on 14.10.26
+#
+#Created for pymepps
+#
+#@author: Tobias Sebastian Finn, tobias.sebastian.finn@studium.uni-hamburg.de
+#
+#    Copyright (C) {2026}  {Tobias Sebastian Finn}
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+"""
+Numba-compiled interpolation kernels for structured grids. This module needs
+numba and raises an ImportError if numba is not installed.
+"""
+
+# System modules
+import logging
+
+# External modules
+from numba import njit, prange
+
+# Internal modules
+
+
+logger = logging.getLogger(__name__)
+
+
+@njit(parallel=True, cache=True)
+def nearest_structured(data, xi, yi, out):
+    """
+    Nearest neighbour interpolation of the given data to the given fractional
+    indices.
+
+    Parameters
+    ----------
+    data : numpy.ndarray
+        The source data with the shape (batch, y, x).
+    xi : numpy.ndarray
+        The fractional x-indices of the target grid within the source grid.
+        The indices should be already clipped to the source grid.
+    yi : numpy.ndarray
+        The fractional y-indices of the target grid within the source grid.
+        The indices should be already clipped to the source grid.
+    out : numpy.ndarray
+        The interpolated data is written into this array with the shape
+        (batch, )+xi.shape.
+    """
+    ny, nx = xi.shape
+    for b in prange(data.shape[0]):
+        for j in range(ny):
+            for i in range(nx):
+                out[b, j, i] = data[b, int(round(yi[j, i])),
+                                    int(round(xi[j, i]))]
+
+
+@njit(parallel=True, cache=True)
+def bilinear_structured(data, xi, yi, out):
+    """
+    Bilinear interpolation of the given data to the given fractional indices.
+
+    Parameters
+    ----------
+    data : numpy.ndarray
+        The source data with the shape (batch, y, x).
+    xi : numpy.ndarray
+        The fractional x-indices of the target grid within the source grid.
+        The indices should be already clipped to the source grid.
+    yi : numpy.ndarray
+        The fractional y-indices of the target grid within the source grid.
+        The indices should be already clipped to the source grid.
+    out : numpy.ndarray
+        The interpolated data is written into this array with the shape
+        (batch, )+xi.shape.
+    """
+    ny, nx = xi.shape
+    max_y = data.shape[1]-1
+    max_x = data.shape[2]-1
+    for b in prange(data.shape[0]):
+        for j in range(ny):
+            for i in range(nx):
+                y_0 = int(yi[j, i])
+                x_0 = int(xi[j, i])
+                y_1 = min(y_0+1, max_y)
+                x_1 = min(x_0+1, max_x)
+                w_y = yi[j, i]-y_0
+                w_x = xi[j, i]-x_0
+                out[b, j, i] = (1.-w_y)*(1.-w_x)*data[b, y_0, x_0] + \
+                    w_y*w_x*data[b, y_1, x_1] + \
+                    (1.-w_y)*w_x*data[b, y_0, x_1] + \
+                    w_y*(1.-w_x)*data[b, y_1, x_0]
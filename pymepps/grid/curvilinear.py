@@ -57,11 +57,15 @@ def __init__(self, grid_dict):
             'nvertex': 4,
         }
         self._grid_dict.update(grid_dict)
+        for vals_key in ('yvals', 'xvals'):
+            if vals_key in self._grid_dict:
+                self._grid_dict[vals_key] = np.ascontiguousarray(
+                    self._grid_dict[vals_key], dtype=np.float64).ravel()
 
     def _calc_lat_lon(self):
         y, x = self._construct_dim()
-        lat = np.array(self._grid_dict['yvals']).reshape(y.size, x.size)
-        lon = np.array(self._grid_dict['xvals']).reshape(y.size, x.size)
+        lat = self._grid_dict['yvals'].reshape(y.size, x.size)
+        lon = self._grid_dict['xvals'].reshape(y.size, x.size)
         return lat, lon
 
     def lonlatbox(self, data, ll_box):
@@ -31,18 +31,28 @@
 # External modules
 import numpy as np
 import xarray as xr
-from mpl_toolkits.basemap import interp
-from scipy.interpolate import griddata
+from scipy.interpolate import LinearNDInterpolator
+from scipy.spatial import cKDTree, Delaunay
+try:
+    import numexpr as ne
+except ImportError:
+    ne = None
 
 # Internal modules
 import pymepps
+try:
+    from ._interp_numba import nearest_structured, bilinear_structured
+except ImportError:
+    nearest_structured = None
+    bilinear_structured = None
 
 
 logger = logging.getLogger(__name__)
 
 
+# The conversion rules to degree, None indicates that no conversion is needed.
 known_units = {
-    'deg': lambda x: x,
+    'deg': None,
     'rad': lambda x: x*180/np.pi,
 }
 
@@ -54,6 +64,11 @@ class Grid(object):
     # TODO: Normalize lon lat values.
     def __init__(self, grid_dict):
         self._lat_lon = None
+        self._raw_lat_lon = None
+        self._raw_dim = None
+        self._coords = None
+        self._rad_lat_lon = None
+        self._tree = None
         self._grid_dict = None
         self.__nr_coords = 2
 
@@ -92,28 +107,33 @@ def len_coords(self):
 
     def get_coords(self):
         """
-        Get the coordinates in a xarray-compatible way.
+        Get the coordinates in a xarray-compatible way. The coordinates are
+        constructed only once and are then cached within this grid instance,
+        such that every DataArray on this grid can reuse the same index.
 
         Returns
         -------
-        coords: dict(str, (str, numpy.ndarray))
+        coords: dict(str, xarray.IndexVariable)
             The coordinates in a xarray compatible coordinates format. The key
-            is the coordinate name. The coordinates have as value a tuple with
-            their own name, indicating that the they are self-describing, and
-            the coordinate values as numpy array.
-        """
-        dim_vals = self._construct_dim()
-        dim_names = self.get_coord_names()
-        if isinstance(dim_vals, tuple):
-            coords = {name: ((name,), dim_vals[k])
-                      for k, name in enumerate(dim_names)}
-        elif isinstance(dim_vals, np.ndarray):
-            coords = {name: ((name,), dim_vals)
-                      for k, name in enumerate(dim_names)}
-        else:
-            TypeError('The return value of construct dim has to be a tuple or '
-                      'numpy array!')
-        return coords
+            is the coordinate name. The coordinates have as value an index
+            variable with their own name as dimension, indicating that they are
+            self-describing. The returned dict is a new dict, but the index
+            variables are shared.
+        """
+        if self._coords is None:
+            dim_vals = self.raw_dim
+            dim_names = self.get_coord_names()
+            if isinstance(dim_vals, tuple):
+                coords = {name: xr.IndexVariable((name,), dim_vals[k])
+                          for k, name in enumerate(dim_names)}
+            elif isinstance(dim_vals, np.ndarray):
+                coords = {name: xr.IndexVariable((name,), dim_vals)
+                          for name in dim_names}
+            else:
+                raise TypeError('The return value of construct dim has to be '
+                                'a tuple or numpy array!')
+            self._coords = coords
+        return dict(self._coords)
 
     @abc.abstractmethod
     def _construct_dim(self):
@@ -123,7 +143,8 @@ def _construct_dim(self):
     def raw_dim(self):
         """
         Get the raw dimension values, as they are constructed by the grid
-        description.
+        description. The dimension values are constructed only once and are
+        then cached within this grid instance.
 
         Returns
         -------
@@ -131,11 +152,13 @@ def raw_dim(self):
             The constructed dimensions. Depending on the given grid type, it is
             either a tuple of arrays or a single array.
         """
-        return self._construct_dim()
+        if self._raw_dim is None:
+            self._raw_dim = self._construct_dim()
+        return self._raw_dim
 
     @property
     def shape(self):
-        return [len(dim) for dim in self._construct_dim()]
+        return [len(dim) for dim in self.raw_dim]
 
     @property
     def lat_lon(self):
@@ -154,7 +177,7 @@ def lat_lon(self):
 
     def _get_lat_lon(self):
         coords = self.get_coords()
-        lat, lon = self._calc_lat_lon()
+        lat, lon = self.raw_lat_lon()
         ds = xr.Dataset(
             {
                 'latitude': (
@@ -171,7 +194,56 @@ def _calc_lat_lon(self):
         pass
 
     def raw_lat_lon(self):
-        return self._calc_lat_lon()
+        """
+        Get the latitude and longitude values for every grid point as numpy
+        arrays. The values are calculated only once and are then cached within
+        this grid instance. The cached arrays are read-only.
+
+        Returns
+        -------
+        lat : numpy.ndarray
+            The latitude values in degrees.
+        lon : numpy.ndarray
+            The longitude values in degrees.
+        """
+        if self._raw_lat_lon is None:
+            lat, lon = self._calc_lat_lon()
+            lat = np.asarray(lat).view()
+            lon = np.asarray(lon).view()
+            lat.setflags(write=False)
+            lon.setflags(write=False)
+            self._raw_lat_lon = (lat, lon)
+        return self._raw_lat_lon
+
+    @property
+    def _lat_lon_rad(self):
+        """
+        The latitude and longitude values in radians together with the cosine
+        of the latitude values. The values are calculated at the first access
+        and then cached.
+        """
+        if self._rad_lat_lon is None:
+            src_lat, src_lon = self.raw_lat_lon()
+            lat_rad = np.deg2rad(src_lat)
+            self._rad_lat_lon = (lat_rad, np.deg2rad(src_lon), np.cos(lat_rad))
+        return self._rad_lat_lon
+
+    @property
+    def _kdtree(self):
+        """
+        The KD-tree of the grid points as cartesian coordinates on the unit
+        sphere. The tree is built at the first access and then cached. If the
+        grid has missing coordinates, no tree is built and False is cached.
+        """
+        if self._tree is None:
+            lat_rad, lon_rad, cos_lat = self._lat_lon_rad
+            src_points = _rad_to_cartesian(lat_rad.ravel(), lon_rad.ravel(),
+                                           cos_lat.ravel())
+            if np.isfinite(src_points).all():
+                self._tree = cKDTree(src_points)
+            else:
+                self._tree = False
+        return self._tree
 
     @staticmethod
     def normalize_lat_lon(lat, lon, data=None):
@@ -180,6 +252,11 @@ def normalize_lat_lon(lat, lon, data=None):
         conform coordinates. If the longitude values are between 0° and 360°,
         they will be normalized to values between -180° and 180°. Then the
         coordinates will be reorder, such that they are in an increasing order.
+        For two-dimensional coordinates the latitudes are sorted along the
+        first and the longitudes along the second axis. Already monotonic axes
+        are only sliced, such that no data is copied for them.
+        One-dimensional and curvilinear coordinates, where the latitudes and
+        longitudes are not separable into the two axes, are only normalized.
 
         Parameters
         ----------
@@ -203,16 +280,18 @@ def normalize_lat_lon(lat, lon, data=None):
             The orderd data based on given latitudes and longitudes. This is
             None if no other data was given as parameter.
         """
-        while np.any(lon > 180):
-            lon[lon > 180] -= 360
-        sort_order_lat = np.argsort(lat, 0)
-        sort_order_lon = np.argsort(lon, 1)
+        lon = np.asarray(lon)
+        lon = np.where(lon > 180, 180-np.mod(180-lon, 360), lon)
+        if lon.ndim < 2 or not _is_rectilinear(lat, lon):
+            return lat, lon, data
+        sort_ind_lat = _sort_index(lat[:, 0])
+        sort_ind_lon = _sort_index(lon[0, :])
         if data is None:
             ordered_data = None
         else:
-            ordered_data = data[..., sort_order_lat, sort_order_lon]
-        ordered_lat = lat[sort_order_lat, sort_order_lon]
-        ordered_lon = lon[sort_order_lat, sort_order_lon]
+            ordered_data = data[..., sort_ind_lat, :][..., sort_ind_lon]
+        ordered_lat = lat[sort_ind_lat, :][:, sort_ind_lon]
+        ordered_lon = lon[sort_ind_lat, :][:, sort_ind_lon]
         return ordered_lat, ordered_lon, ordered_data
 
     def get_coord_names(self):
@@ -231,26 +310,24 @@ def get_coord_names(self):
     def _interpolate_unstructured(self, data, src_lat, src_lon,
                                   trg_lat, trg_lon, order=0):
         """
-        The interpolation is done with scipy.interpolate.griddata.
+        Interpolate the data with a linear interpolation on a Delaunay
+        triangulation or with the nearest neighbour within a cKDTree. The
+        triangulation and the tree are built only once for all slices of the
+        data, such that all slices are interpolated in a single step.
         """
+        reshaped_data = data.reshape((-1, src_lat.size))
+        unravel_shape = data.shape[:-self.len_coords]+trg_lat.shape
+        src_coords = _stack_coords(src_lat, src_lon)
+        trg_coords = _stack_coords(trg_lat, trg_lon)
         if order == 1:
-            method = 'linear'
+            interpolator = LinearNDInterpolator(
+                Delaunay(src_coords), reshaped_data.T)
+            remapped_data = interpolator(trg_coords).T
         else:
-            method = 'nearest'
-        reshaped_data = data.reshape((-1, src_lat.size))
-        unravel_shape = data.shape[:-self.len_coords]
-        src_lat = src_lat.ravel()
-        src_lon = src_lon.ravel()
-        src_coords = np.concatenate((src_lat, src_lon), axis=1)
-        unravel_shape = tuple(list(unravel_shape)+list(trg_lat.shape))
-        remapped_data = np.zeros((reshaped_data.shape[0], trg_lat.size))
-        trg_lat = trg_lat.ravel()
-        trg_lon = trg_lon.ravel()
-        trg_coords = np.concatenate((trg_lat, trg_lon), axis=1)
-        for i in range(reshaped_data.shape[0]):
-            sliced_array = reshaped_data[i, :]
-            remapped_data[i, :] = griddata(src_coords, sliced_array, trg_coords,
-                                           method=method)
+            _, nearest_ind = cKDTree(src_coords).query(trg_coords, k=1)
+            remapped_data = reshaped_data[:, nearest_ind]
+        remapped_data = remapped_data.astype(
+            _interpolation_dtype(data.dtype), copy=False)
         remapped_data = remapped_data.reshape(unravel_shape)
         remapped_data = np.atleast_1d(remapped_data)
         return remapped_data
@@ -258,20 +335,60 @@ def _interpolate_unstructured(self, data, src_lat, src_lon,
     def _interpolate_structured(self, data, src_lat, src_lon,
                                 trg_lat, trg_lon, order=0):
         """
-        Interpolate structured data with basemap.interp function.
-        """
-        reshaped_data = data.reshape((-1, data.shape[-2], data.shape[-1]))
-        remapped_data = np.zeros(
-            (reshaped_data.shape[0], trg_lat.shape[-2], trg_lat.shape[-1]))
-        for i in range(reshaped_data.shape[0]):
-            sliced_array = reshaped_data[i, :, :]
-            remapped_data[i, :, :] = interp(sliced_array.T, src_lat, src_lon,
-                                            trg_lat, trg_lon, order=order)
-        remapped_shape = list(data.shape[:-2])+list(remapped_data.shape[-2:])
-        remapped_data = remapped_data.reshape(remapped_shape)
+        Interpolate structured data in the same way as the basemap.interp
+        function. The fractional indices of the target coordinates are
+        calculated only once and are then applied to all leading dimensions of
+        the data at the same time. If numba is installed, the interpolation is
+        done by compiled kernels.
+        """
+        if order not in (0, 1):
+            raise ValueError('The interpolation order has to be 0 or 1!')
+        ind_lat = _fractional_index(src_lat, trg_lat)
+        ind_lon = _fractional_index(src_lon, trg_lon)
+        if nearest_structured is None:
+            remapped_data = self._interpolate_indices(data, ind_lat, ind_lon,
+                                                      order=order)
+        else:
+            reshaped_data = data.reshape((-1, data.shape[-2], data.shape[-1]))
+            remapped_data = np.empty(
+                (reshaped_data.shape[0], trg_lat.shape[-2], trg_lat.shape[-1]),
+                dtype=_interpolation_dtype(data.dtype))
+            if order == 1:
+                bilinear_structured(reshaped_data, ind_lon, ind_lat,
+                                    remapped_data)
+            else:
+                nearest_structured(reshaped_data, ind_lon, ind_lat,
+                                   remapped_data)
+            remapped_shape = list(data.shape[:-2]) + \
+                list(remapped_data.shape[-2:])
+            remapped_data = remapped_data.reshape(remapped_shape)
         remapped_data = np.atleast_2d(remapped_data)
         return remapped_data
 
+    @staticmethod
+    def _interpolate_indices(data, ind_lat, ind_lon, order=0):
+        """
+        Interpolate the data with numpy to the given fractional indices. This
+        is used if numba is not available.
+        """
+        out_dtype = _interpolation_dtype(data.dtype)
+        if order == 1:
+            lat_0 = ind_lat.astype(np.int32)
+            lon_0 = ind_lon.astype(np.int32)
+            lat_1 = np.clip(lat_0+1, 0, data.shape[-2]-1)
+            lon_1 = np.clip(lon_0+1, 0, data.shape[-1]-1)
+            w_lat = (ind_lat-lat_0).astype(out_dtype)
+            w_lon = (ind_lon-lon_0).astype(out_dtype)
+            remapped_data = (1.-w_lat)*(1.-w_lon)*data[..., lat_0, lon_0] + \
+                w_lat*w_lon*data[..., lat_1, lon_1] + \
+                (1.-w_lat)*w_lon*data[..., lat_0, lon_1] + \
+                w_lat*(1.-w_lon)*data[..., lat_1, lon_0]
+        else:
+            lat_0 = np.around(ind_lat).astype(np.int32)
+            lon_0 = np.around(ind_lon).astype(np.int32)
+            remapped_data = data[..., lat_0, lon_0].astype(out_dtype)
+        return remapped_data
+
     def interpolate(self, data, other_grid, order=0):
         """
         Interpolate the given data to the given other grid.
@@ -280,7 +397,9 @@ def interpolate(self, data, other_grid, order=0):
         ----------
         data : numpy.ndarray or xarray.DataArray
             This data is used for the  interpolation. The shape of data's grid
-            axis needs to be the same as this grid.
+            axis needs to be the same as this grid. If the data is a
+            dask-backed xarray.DataArray, the interpolation is lazily
+            evaluated for every chunk of the non-grid dimensions.
         other_grid : Grid instance
             The other_grid is used as target grid for the interpolation.
         order : int, optional
@@ -295,29 +414,16 @@ def interpolate(self, data, other_grid, order=0):
             data is a xarray.DataArray the output data will use the same
             attributes and non-grid dimensions as the input data.
         """
+        if not hasattr(other_grid, 'raw_lat_lon'):
+            raise TypeError('other_grid has to be a child instance of Grid!')
+        if isinstance(data, xr.DataArray) and data.chunks is not None:
+            return self._interpolate_dask(data, other_grid, order=order)
         if isinstance(data, xr.DataArray):
             data_values = data.values
         else:
             data_values = data
-        src_lat, src_lon = self._calc_lat_lon()
-        if data_values.shape[-self.len_coords:] != src_lat.shape:
-            raise ValueError(
-                'The last {0:d} dimensions of the data needs the same shape as '
-                'the coordinates of this grid!'.format())
-        src_lat, src_lon, data_values = self.normalize_lat_lon(
-            src_lat, src_lon, data_values)
-        try:
-            trg_lat, trg_lon = other_grid.raw_lat_lon()
-        except AttributeError:
-            raise TypeError('other_grid has to be a child instance of Grid!')
-        trg_lat, trg_lon, _ = self.normalize_lat_lon(trg_lat, trg_lon)
-        if min((self.len_coords, other_grid.len_coords)) == 1:
-            remapped_data = self._interpolate_unstructured(
-                data_values, src_lat, src_lon, trg_lat, trg_lon, order=order)
-        else:
-            remapped_data = self._interpolate_structured(
-                data_values, src_lat[:, 0], src_lon[0, :], trg_lat, trg_lon,
-                order=order)
+        remapped_data = self._interpolate_values(data_values, other_grid,
+                                                 order=order)
         if isinstance(data, xr.DataArray):
             data_dims = [dim for dim in data.dims
                          if dim not in self.get_coord_names()]
@@ -332,14 +438,125 @@ def interpolate(self, data, other_grid, order=0):
             )
         return remapped_data
 
+    def _interpolate_values(self, data_values, other_grid, order=0):
+        """
+        Interpolate the given numpy array to the given other grid. The last
+        dimensions of the array have to be the grid dimensions.
+        """
+        src_lat, src_lon = self.raw_lat_lon()
+        if data_values.shape[-self.len_coords:] != src_lat.shape:
+            raise ValueError(
+                'The last {0:d} dimensions of the data needs the same shape as '
+                'the coordinates of this grid!'.format(self.len_coords))
+        src_lat, src_lon, data_values = self.normalize_lat_lon(
+            src_lat, src_lon, data_values)
+        trg_lat, trg_lon = other_grid.raw_lat_lon()
+        trg_lat, trg_lon, _ = self.normalize_lat_lon(trg_lat, trg_lon)
+        if self.len_coords == 2 and other_grid.len_coords == 1 and \
+                _is_rectilinear(src_lat, src_lon):
+            # The regular structure of the source grid is used to find the
+            # target points without a cKDTree or a triangulation.
+            remapped_data = self._interpolate_structured(
+                data_values, src_lat[:, 0], src_lon[0, :],
+                trg_lat[np.newaxis, :], trg_lon[np.newaxis, :], order=order)
+            remapped_data = remapped_data[..., 0, :]
+            if order == 1:
+                # Like the unstructured linear interpolation, target points
+                # outside of the source grid are set to NaN
+                outside = (trg_lat < src_lat[0, 0]) | \
+                    (trg_lat > src_lat[-1, 0]) | \
+                    (trg_lon < src_lon[0, 0]) | (trg_lon > src_lon[0, -1])
+                remapped_data[..., outside] = np.nan
+        elif min((self.len_coords, other_grid.len_coords)) == 1 or \
+                not _is_rectilinear(src_lat, src_lon):
+            remapped_data = self._interpolate_unstructured(
+                data_values, src_lat, src_lon, trg_lat, trg_lon, order=order)
+        else:
+            remapped_data = self._interpolate_structured(
+                data_values, src_lat[:, 0], src_lon[0, :], trg_lat, trg_lon,
+                order=order)
+        return remapped_data
+
+    def _interpolate_dask(self, data, other_grid, order=0):
+        """
+        Interpolate a dask-backed xarray.DataArray to the given other grid. The
+        interpolation is applied lazily and in parallel on every chunk of the
+        non-grid dimensions with xarray.apply_ufunc.
+        """
+        src_dims = list(self.get_coord_names())
+        trg_dims = list(other_grid.get_coord_names())
+        trg_shape = other_grid.raw_lat_lon()[0].shape
+        data = data.chunk({dim: -1 for dim in src_dims})
+        remapped_data = xr.apply_ufunc(
+            self._interpolate_values, data,
+            kwargs=dict(other_grid=other_grid, order=order),
+            input_core_dims=[src_dims],
+            output_core_dims=[trg_dims],
+            exclude_dims=set(src_dims),
+            dask='parallelized',
+            output_dtypes=[_interpolation_dtype(data.dtype)],
+            dask_gufunc_kwargs=dict(
+                output_sizes=dict(zip(trg_dims, trg_shape))),
+            keep_attrs=True
+        )
+        remapped_data = remapped_data.assign_coords(**other_grid.get_coords())
+        return remapped_data
+
     def nearest_point(self, coord):
-        src_lat, src_lon = self._calc_lat_lon()
-        calc_distance = distance_haversine(
-            coord,
-            (src_lat.flatten(), src_lon.flatten()))
-        nearest_ind = np.unravel_index(calc_distance.argmin(), src_lat.shape)
+        """
+        Get the index of the nearest grid point to the given coordinate. The
+        nearest grid point is searched with a cached KD-tree on the unit
+        sphere, where the euclidean distance is monotone to the great circle
+        distance. If the grid has missing coordinates, the nearest grid point
+        is searched with the haversine distance instead, where the missing
+        grid points are skipped.
+
+        Parameters
+        ----------
+        coord : tuple(float, float)
+            The coordinate (latitude, longitude) in degrees.
+
+        Returns
+        -------
+        nearest_ind : tuple(int)
+            The index of the nearest grid point with one entry for every grid
+            coordinate.
+        """
+        tree = self._kdtree
+        if tree is False:
+            flat_ind = np.nanargmin(self.distance(coord))
+        else:
+            lat, lon = coord
+            trg_point = _lat_lon_to_cartesian(float(lat), float(lon))
+            _, flat_ind = tree.query(trg_point, k=1)
+        nearest_ind = np.unravel_index(flat_ind, self.raw_lat_lon()[0].shape)
         return nearest_ind
 
+    def distance(self, coord):
+        """
+        Calculate the great circle distance between every grid point and the
+        given coordinate with the haversine formula. The radian values of the
+        grid points are cached, such that only the given coordinate needs
+        to be converted.
+
+        Parameters
+        ----------
+        coord : tuple(float, float)
+            The coordinate (latitude, longitude) in degrees.
+
+        Returns
+        -------
+        distance : numpy.ndarray
+            The haversine distance in meters with the same shape as the grid
+            coordinates.
+        """
+        lat, lon = coord
+        lat_rad = np.deg2rad(float(lat))
+        lon_rad = np.deg2rad(float(lon))
+        src_lat_rad, src_lon_rad, src_cos_lat = self._lat_lon_rad
+        return _haversine_from_rad(lat_rad, lon_rad, np.cos(lat_rad),
+                                   src_lat_rad, src_lon_rad, src_cos_lat)
+
     def get_nearest_point(self, data, coord):
         """
         Get the nearest neighbour grid point for a given coordinate. The
@@ -365,7 +582,7 @@ def get_nearest_point(self, data, coord):
             without the horizontal coordinate dimensions. There is at least one
             dimension.
         """
-        src_lat, src_lon = self._calc_lat_lon()
+        src_lat, src_lon = self.raw_lat_lon()
         if data.shape[-self.len_coords:] != src_lat.shape:
             raise ValueError(
                 'The last two dimension of the data needs the same shape as '
@@ -415,7 +632,7 @@ def _lonlatbox(self, data, ll_box, unstructured=False):
             data_values = data.values
         else:
             data_values = data
-        src_lat, src_lon = self._calc_lat_lon()
+        src_lat, src_lon = self.raw_lat_lon()
         if data_values.shape[-self.len_coords:] != src_lat.shape:
             raise ValueError(
                 'The last two dimension of the data needs the same shape as '
@@ -442,19 +659,15 @@ def _lonlatbox(self, data, ll_box, unstructured=False):
         return sliced_data, sliced_grid
 
     def _structured_box(self, data, ll_box):
-        calc_lat, calc_lon = self._construct_dim()
+        calc_lat, calc_lon = self.raw_dim
         if not len(ll_box) == 4:
             raise ValueError(
                 'The latitude-longitude box doesn\'t have a length of 4, '
                 'instead the length is: {0:d}'.format(len(ll_box)))
         lon_box = (ll_box[0], ll_box[2])
         lat_box = (ll_box[1], ll_box[3])
-        lat_bound = np.logical_and(
-            calc_lat >= np.min(lat_box), calc_lat <= np.max(lat_box)
-        )
-        lon_bound = np.logical_and(
-            calc_lon >= np.min(lon_box), calc_lon <= np.max(lon_box)
-        )
+        lat_bound = _bound_index(calc_lat, lat_box)
+        lon_bound = _bound_index(calc_lon, lon_box)
         sliced_data = data[..., lat_bound, :][..., lon_bound]
 
         lat_vals = calc_lat[lat_bound]
@@ -463,14 +676,14 @@ def _structured_box(self, data, ll_box):
         new_grid_dict = deepcopy(self._grid_dict)
         new_grid_dict['ysize'] = len(lat_vals)
         new_grid_dict['xsize'] = len(lon_vals)
-        new_grid_dict['yvals'] = list(lat_vals)
-        new_grid_dict['xvals'] = list(lon_vals)
+        new_grid_dict['yvals'] = np.array(lat_vals)
+        new_grid_dict['xvals'] = np.array(lon_vals)
         keys_to_del = ['yfirst', 'yinc', 'xfirst', 'xinc']
         [new_grid_dict.pop(k, None) for k in keys_to_del]
         return sliced_data, new_grid_dict
 
     def _unstructured_box(self, data, ll_box):
-        calc_lat, calc_lon = self._calc_lat_lon()
+        calc_lat, calc_lon = self.raw_lat_lon()
         if data.shape[-self.len_coords:] != calc_lat.shape:
             raise ValueError(
                 'The last dimension(s) of the data needs the same shape as '
@@ -481,13 +694,8 @@ def _unstructured_box(self, data, ll_box):
                 'instead the length is: {0:d}'.format(len(ll_box)))
         lon_box = (ll_box[0], ll_box[2])
         lat_box = (ll_box[1], ll_box[3])
-        bound = np.all((
-            calc_lat >= np.min(lat_box),
-            calc_lat <= np.max(lat_box),
-            calc_lon >= np.min(lon_box),
-            calc_lon <= np.max(lon_box)
-        ), axis=0)
-        if np.sum(bound) == 0:
+        bound = _box_mask(calc_lat, calc_lon, lat_box, lon_box)
+        if not np.any(bound):
             raise ValueError('Only an empty array remains, please choose '
                              'another longitude-latitude box!')
         sliced_data = data[..., bound]
@@ -505,32 +713,269 @@ def _unstructured_box(self, data, ll_box):
             yname='lat',
             yunits='degrees',)
         new_grid_dict['gridsize'] = len(lat_vals)
-        new_grid_dict['yvals'] = list(lat_vals)
-        new_grid_dict['xvals'] = list(lon_vals)
+        new_grid_dict['yvals'] = np.array(lat_vals)
+        new_grid_dict['xvals'] = np.array(lon_vals)
         return sliced_data, new_grid_dict
 
     @staticmethod
     def convert_to_deg(field, unit):
         """
-        Method to convert given field with given unit into degree.
+        Method to convert given field with given unit into degree. The first
+        known unit, which is part of the given unit, is used for the
+        conversion. A field which is already in degree is returned unchanged.
 
         Parameters
         ----------
-        field
-        unit
+        field : numpy.ndarray
+            The field which should be converted.
+        unit : str
+            The unit of the field, e.g. degrees_north or radian.
 
         Returns
         -------
+        calculated_field : numpy.ndarray
+            The field converted into degree.
 
+        Raises
+        ------
+        ValueError
+            If there is no conversion rule for the given unit.
         """
+        lower_unit = unit.lower()
         try:
-            calculated_field = [known_units[known](field)
-                                for known in known_units
-                                if known in unit.lower()][0]
-        except IndexError:
+            known = next(known for known in known_units if known in lower_unit)
+        except StopIteration:
             raise ValueError('There is no calculating rule for the given unit '
                              '{0:s} defined yet!'.format(unit))
-        return calculated_field
+        if known_units[known] is None:
+            return field
+        return known_units[known](field)
+
+
+def _box_mask(lat, lon, lat_box, lon_box):
+    """
+    Get a boolean mask of the coordinates within the given box. The bounds
+    are evaluated in a single pass with numexpr, if it is installed, and
+    otherwise in-place into the same boolean array.
+
+    Parameters
+    ----------
+    lat : numpy.ndarray
+        The latitude values.
+    lon : numpy.ndarray
+        The longitude values with the same shape as the latitude values.
+    lat_box : tuple(float, float)
+        The latitude bounds of the box. The bounds are inclusive.
+    lon_box : tuple(float, float)
+        The longitude bounds of the box. The bounds are inclusive.
+
+    Returns
+    -------
+    mask : numpy.ndarray
+        The boolean mask, which is True for coordinates within the box.
+    """
+    bounds = dict(lat_min=np.min(lat_box), lat_max=np.max(lat_box),
+                  lon_min=np.min(lon_box), lon_max=np.max(lon_box))
+    if ne is not None:
+        return ne.evaluate(
+            '(lat >= lat_min) & (lat <= lat_max) & '
+            '(lon >= lon_min) & (lon <= lon_max)',
+            local_dict=dict(lat=lat, lon=lon, **bounds))
+    mask = lat >= bounds['lat_min']
+    mask &= lat <= bounds['lat_max']
+    mask &= lon >= bounds['lon_min']
+    mask &= lon <= bounds['lon_max']
+    return mask
+
+
+def _sort_index(coord):
+    """
+    Get the index to sort the given coordinate values in an increasing order.
+    For increasing or decreasing coordinates the index is a slice, which
+    creates a view of the indexed array.
+
+    Parameters
+    ----------
+    coord : numpy.ndarray
+        The one-dimensional coordinate values.
+
+    Returns
+    -------
+    sort_ind : slice or numpy.ndarray
+        The index to sort the coordinates. If the coordinates are monotonic
+        this is a slice, else the indices from numpy.argsort.
+    """
+    coord_inc = np.diff(coord)
+    if np.all(coord_inc >= 0):
+        return slice(None)
+    elif np.all(coord_inc <= 0):
+        return slice(None, None, -1)
+    return np.argsort(coord)
+
+
+def _interpolation_dtype(dtype):
+    """
+    Get the floating point dtype of the interpolated data. Data types which can
+    be represented as float32, e.g. float32 fields from grib files, are
+    interpolated as float32, all other data types as float64.
+
+    Parameters
+    ----------
+    dtype : numpy.dtype
+        The dtype of the data, which should be interpolated.
+
+    Returns
+    -------
+    out_dtype : numpy.dtype
+        The dtype of the interpolated data.
+    """
+    return np.result_type(dtype, np.float32)
+
+
+def _is_rectilinear(lat, lon):
+    """
+    Check if the two-dimensional latitudes are constant along the second and
+    the longitudes are constant along the first axis.
+    """
+    return np.allclose(lat, lat[:, :1]) and np.allclose(lon, lon[:1, :])
+
+
+def _fractional_index(src_coord, trg_coord):
+    """
+    Calculate the fractional index of the target coordinates within the
+    source coordinates. The calculation is based on basemap.interp, such that
+    target coordinates outside the source coordinates are clipped to the
+    boundary indices.
+
+    Parameters
+    ----------
+    src_coord : numpy.ndarray
+        The one-dimensional and increasing source coordinates.
+    trg_coord : numpy.ndarray
+        The target coordinates. They could have any shape.
+
+    Returns
+    -------
+    frac_ind : numpy.ndarray
+        The fractional index for every target coordinate with the same shape
+        as the target coordinates.
+    """
+    if src_coord[-1]-src_coord[0] < 0:
+        raise ValueError('The source coordinates have to be increasing!')
+    src_inc = np.diff(src_coord)
+    if src_inc.max()-src_inc.min() < 1E-4:
+        frac_ind = (src_coord.size-1)*(trg_coord-src_coord[0]) / \
+                   (src_coord[-1]-src_coord[0])
+    else:
+        frac_ind = np.interp(trg_coord, src_coord, np.arange(src_coord.size))
+    frac_ind = np.clip(frac_ind, 0, src_coord.size-1)
+    return frac_ind
+
+
+def _bound_index(dim_vals, bounds):
+    """
+    Get the index of the dimension values within the given bounds. For
+    monotonic dimension values the index is searched with a binary search and
+    returned as slice, such that the indexed data is a view of the original
+    data. Non-monotonic dimension values are indexed with a boolean mask.
+
+    Parameters
+    ----------
+    dim_vals : numpy.ndarray
+        The one-dimensional dimension values.
+    bounds : tuple(float, float)
+        The bounds of the box. The bounds are inclusive and the order of the
+        bounds doesn't matter.
+
+    Returns
+    -------
+    ind : slice or numpy.ndarray
+        The index of the dimension values within the bounds. If the dimension
+        values are monotonic this is a slice, else a boolean mask.
+    """
+    lower, upper = np.min(bounds), np.max(bounds)
+    dim_inc = np.diff(dim_vals)
+    if np.all(dim_inc >= 0):
+        start = np.searchsorted(dim_vals, lower, side='left')
+        end = np.searchsorted(dim_vals, upper, side='right')
+    elif np.all(dim_inc <= 0):
+        inv_vals = dim_vals[::-1]
+        start = dim_vals.size-np.searchsorted(inv_vals, upper, side='right')
+        end = dim_vals.size-np.searchsorted(inv_vals, lower, side='left')
+    else:
+        return np.logical_and(dim_vals >= lower, dim_vals <= upper)
+    return slice(int(start), int(end))
+
+
+def _stack_coords(lat, lon):
+    """
+    Stack the given latitude and longitude values as point coordinates into a
+    pre-allocated array.
+
+    Parameters
+    ----------
+    lat : numpy.ndarray
+        The latitude values. They could have any shape.
+    lon : numpy.ndarray
+        The longitude values with the same shape as the latitude values.
+
+    Returns
+    -------
+    coords : numpy.ndarray
+        The point coordinates with the shape (lat.size, 2). The first column
+        are the latitude values and the second column the longitude values.
+    """
+    coords = np.empty((lat.size, 2), dtype=np.result_type(lat, lon))
+    coords[:, 0] = lat.ravel()
+    coords[:, 1] = lon.ravel()
+    return coords
+
+
+def _lat_lon_to_cartesian(lat, lon):
+    """
+    Convert the given latitude and longitude values to cartesian coordinates
+    on the unit sphere.
+
+    Parameters
+    ----------
+    lat : float or numpy.ndarray
+        The latitude values in degrees.
+    lon : float or numpy.ndarray
+        The longitude values in degrees.
+
+    Returns
+    -------
+    points : numpy.ndarray
+        The cartesian coordinates (x, y, z) as last axis.
+    """
+    lat = np.deg2rad(lat)
+    lon = np.deg2rad(lon)
+    return _rad_to_cartesian(lat, lon, np.cos(lat))
+
+
+def _rad_to_cartesian(lat, lon, cos_lat):
+    """
+    Convert the given latitude and longitude values in radians to cartesian
+    coordinates on the unit sphere.
+
+    Parameters
+    ----------
+    lat : float or numpy.ndarray
+        The latitude values in radians.
+    lon : float or numpy.ndarray
+        The longitude values in radians.
+    cos_lat : float or numpy.ndarray
+        The precomputed cosine of the latitude values.
+
+    Returns
+    -------
+    points : numpy.ndarray
+        The cartesian coordinates (x, y, z) as last axis.
+    """
+    points = np.stack((cos_lat*np.cos(lon), cos_lat*np.sin(lon), np.sin(lat)),
+                      axis=-1)
+    return points
+
 
 def distance_haversine(p1, p2):
     """
@@ -561,11 +1006,45 @@ def distance_haversine(p1, p2):
     """
     lat1, lon1 = p1
     lat2, lon2 = p2
-    R = 6371E3
     lat1, lon1, lat2, lon2 = map(np.deg2rad, [lat1, lon1, lat2, lon2])
+    d = _haversine_from_rad(lat1, lon1, np.cos(lat1), lat2, lon2, np.cos(lat2))
+    return d
+
+
+def _haversine_from_rad(lat1, lon1, cos_lat1, lat2, lon2, cos_lat2):
+    """
+    Calculate the haversine distance for coordinates, which are already
+    converted into radians. The cosine of the latitudes has to be precomputed,
+    such that it could be reused for repeated calls. If numexpr is installed,
+    the distance for arrays is evaluated within a single fused expression.
+
+    Parameters
+    ----------
+    lat1, lon1 : float or numpy.ndarray
+        The coordinates of the first point in radians.
+    cos_lat1 : float or numpy.ndarray
+        The cosine of the first latitude.
+    lat2, lon2 : float or numpy.ndarray
+        The coordinates of the second point in radians.
+    cos_lat2 : float or numpy.ndarray
+        The cosine of the second latitude.
+
+    Returns
+    -------
+    d : float or numpy.ndarray
+        The calculated haversine distance in meters.
+    """
+    R = 6371E3
+    if ne is not None and max(np.ndim(lat1), np.ndim(lat2)) > 0:
+        d = ne.evaluate(
+            'R*2*arcsin(sqrt(sin((lat2-lat1)/2.0)**2 + '
+            'cos_lat1*cos_lat2*sin((lon2-lon1)/2.0)**2))',
+            local_dict=dict(R=R, lat1=lat1, lon1=lon1, cos_lat1=cos_lat1,
+                            lat2=lat2, lon2=lon2, cos_lat2=cos_lat2))
+        return d
     dlon = lon2 - lon1
     dlat = lat2 - lat1
-    a = np.sin(dlat/2.0)**2 + np.cos(lat1) * np.cos(lat2) * np.sin(dlon/2.0)**2
+    a = np.sin(dlat/2.0)**2 + cos_lat1 * cos_lat2 * np.sin(dlon/2.0)**2
     c = 2 * np.arcsin(np.sqrt(a))
     d = R * c
     return d
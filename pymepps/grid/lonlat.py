@@ -64,10 +64,10 @@ def _calc_single_dim(self, dim_name='x'):
             width = self._grid_dict['{0:s}inc'.format(dim_name)]
             calculated_dim = np.arange(
                 start,
-                start + steps * width,
+                start + (steps - 0.5) * width,
                 width)
         except KeyError:
-            calculated_dim = np.array(
+            calculated_dim = np.asarray(
                 self._grid_dict['{0:s}vals'.format(dim_name)])
         if calculated_dim.ndim >= 1:
             calculated_dim = calculated_dim[:int(steps)]
@@ -80,8 +80,12 @@ def _calc_lat_lon(self):
         dim_lat, dim_lon = self._construct_dim()
         dim_lat = self.convert_to_deg(dim_lat, self._grid_dict['yunits'])
         dim_lon = self.convert_to_deg(dim_lon, self._grid_dict['xunits'])
-        lat, lon = np.meshgrid(dim_lat, dim_lon)
-        return lat.transpose(), lon.transpose()
+        dim_lat = np.asarray(dim_lat)
+        dim_lon = np.asarray(dim_lon)
+        grid_shape = (dim_lat.size, dim_lon.size)
+        lat = np.broadcast_to(dim_lat[:, None], grid_shape)
+        lon = np.broadcast_to(dim_lon[None, :], grid_shape)
+        return lat, lon
 
     def lonlatbox(self, data, ll_box):
         """
@@ -86,8 +86,8 @@ def get_coord_names(self):
         return ['ncells',]
 
     def _calc_lat_lon(self):
-        return np.array(self._grid_dict['yvals']),\
-               np.array(self._grid_dict['xvals'])
+        return np.asarray(self._grid_dict['yvals']),\
+               np.asarray(self._grid_dict['xvals'])
 
     def lonlatbox(self, data, ll_box):
         """
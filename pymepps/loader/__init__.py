@@ -1,4 +1,29 @@
-from .model import open_model_dataset
-from .station import open_station_dataset
+import sys
+import importlib
 
 __all__ = ['open_model_dataset', 'open_station_dataset']
+
+# The loaders are imported at their first use, such that the file handler
+# backends are not imported if only the datasets are needed.
+_lazy_attributes = {
+    'open_model_dataset': '.model',
+    'open_station_dataset': '.station',
+}
+
+
+if sys.version_info >= (3, 7):
+    def __getattr__(name):
+        try:
+            module = importlib.import_module(_lazy_attributes[name], __name__)
+        except KeyError:
+            raise AttributeError(
+                'module {0:s} has no attribute {1:s}'.format(__name__, name))
+        attr = getattr(module, name)
+        globals()[name] = attr
+        return attr
+
+    def __dir__():
+        return sorted(set(globals().keys()) | set(_lazy_attributes.keys()))
+else:
+    from .model import open_model_dataset
+    from .station import open_station_dataset
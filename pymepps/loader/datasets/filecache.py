@@ -0,0 +1,212 @@
+#!/bin/env python
+# -*- coding: utf-8 -*-
+#
+#Created on 14.10.26
+#
+#Created for pymepps
+#
+#@author: Tobias Sebastian Finn, tobias.sebastian.finn@studium.uni-hamburg.de
+#
+#    Copyright (C) {2026}  {Tobias Sebastian Finn}
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+# System modules
+import logging
+import atexit
+import threading
+import contextlib
+import weakref
+from collections import OrderedDict, Counter
+
+# External modules
+
+# Internal modules
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_SIZE = 64
+
+
+def _default_cache_size():
+    """
+    The default number of simultaneously opened file handlers is a quarter of
+    the soft limit of open file descriptors, but at most DEFAULT_MAX_SIZE.
+    """
+    try:
+        import resource
+        soft_limit = resource.getrlimit(resource.RLIMIT_NOFILE)[0]
+    except (ImportError, ValueError, OSError):
+        soft_limit = -1
+    if soft_limit <= 0:
+        return DEFAULT_MAX_SIZE
+    return min(max(soft_limit // 4, 1), DEFAULT_MAX_SIZE)
+
+
+class OpenFileCache(object):
+    """
+    A least recently used cache of opened file handlers. A file handler is
+    opened at its first acquisition and stays open until it is evicted from
+    the cache, such that repeated variable selections reuse the opened file.
+    File handlers, which are in use, are never evicted. The cache holds only
+    weak references to the file handlers, such that a file handler, which is
+    not used anymore, is garbage collected together with its opened file.
+
+    Parameters
+    ----------
+    max_size : int or None, optional
+        The maximum number of opened file handlers. If this is None, the
+        default size is used. Default is None.
+    """
+    def __init__(self, max_size=None):
+        self._lock = threading.RLock()
+        self._handlers = OrderedDict()
+        self._in_use = Counter()
+        self._max_size = None
+        self.max_size = max_size
+
+    def __len__(self):
+        return len(self._handlers)
+
+    @property
+    def max_size(self):
+        return self._max_size
+
+    @max_size.setter
+    def max_size(self, new_size):
+        if new_size is None:
+            new_size = _default_cache_size()
+        if not isinstance(new_size, int) or new_size < 1:
+            raise ValueError('The maximum size of the file cache needs to be '
+                             'a positive integer!')
+        self._max_size = new_size
+        with self._lock:
+            evicted = self._evict()
+        self._close(evicted)
+
+    def _evict(self):
+        evicted = []
+        for key in list(self._handlers.keys()):
+            if len(self._handlers) <= self.max_size:
+                break
+            if not self._in_use[key]:
+                evicted.append(self._handlers.pop(key, None))
+        return evicted
+
+    def _remove(self, key):
+        # Called if a cached file handler is garbage collected
+        self._handlers.pop(key, None)
+
+    @staticmethod
+    def _close(handler_refs):
+        for handler_ref in handler_refs:
+            file_handler = None if handler_ref is None else handler_ref()
+            if file_handler is None:
+                continue
+            logger.debug('Closed cached file {0:s}'.format(
+                str(file_handler.file)))
+            file_handler.close()
+
+    @contextlib.contextmanager
+    def acquire(self, file_handler):
+        """
+        Context manager to get an opened file handler from the cache. If the
+        file handler is not cached, it is opened and the least recently used
+        file handlers are closed if the cache is full.
+
+        Parameters
+        ----------
+        file_handler : child of FileHandler
+            The file handler, which should be opened.
+
+        Yields
+        ------
+        file_handler : child of FileHandler
+            The opened file handler.
+        """
+        key = id(file_handler)
+        with self._lock:
+            if key in self._handlers:
+                self._handlers.move_to_end(key)
+            else:
+                self._handlers[key] = weakref.ref(
+                    file_handler, lambda ref, key=key: self._remove(key))
+            self._in_use[key] += 1
+            evicted = self._evict()
+        self._close(evicted)
+        try:
+            # The file handlers open only if they are not already opened
+            file_handler.open()
+            yield file_handler
+        finally:
+            with self._lock:
+                self._in_use[key] -= 1
+                if not self._in_use[key]:
+                    del self._in_use[key]
+                evicted = self._evict()
+            self._close(evicted)
+
+    def close(self, file_handlers):
+        """
+        Close the given file handlers and remove them from the cache. File
+        handlers, which are in use, are not closed.
+
+        Parameters
+        ----------
+        file_handlers : iterable(child of FileHandler)
+            The file handlers, which should be closed.
+        """
+        with self._lock:
+            evicted = [self._handlers.pop(id(file_handler), None)
+                       for file_handler in file_handlers
+                       if not self._in_use[id(file_handler)]]
+        self._close(evicted)
+
+    def close_all(self):
+        """
+        Close all cached file handlers, which are not in use.
+        """
+        with self._lock:
+            evicted = [self._handlers.pop(key, None)
+                       for key in list(self._handlers.keys())
+                       if not self._in_use[key]]
+        self._close(evicted)
+
+
+open_file_cache = OpenFileCache()
+atexit.register(open_file_cache.close_all)
+
+
+def set_max_open_files(max_size=None):
+    """
+    Set the maximum number of simultaneously opened file handlers. The least
+    recently used file handlers are closed if there are more opened file
+    handlers.
+
+    Parameters
+    ----------
+    max_size : int or None, optional
+        The maximum number of opened file handlers. If this is None, the
+        default size is restored. Default is None.
+    """
+    open_file_cache.max_size = max_size
+
+
+def close_open_files():
+    """
+    Close all opened file handlers, which are not in use.
+    """
+    open_file_cache.close_all()
@@ -32,6 +32,8 @@
 
 # Internal modules
 from pymepps.utilities import MultiThread
+from .filecache import open_file_cache
+from ..filehandler import varname_cache
 
 logger = logging.getLogger(__name__)
 
@@ -71,6 +73,21 @@ def __init__(self, file_handlers, data_origin=None, processes=1):
         self.processes = processes
         self.__variables = self._initialize_variables()
 
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        """
+        Close the opened files of this dataset. The files are reopened if
+        data is selected afterwards. The dataset could be also used as
+        context manager, which closes the files at its exit.
+        """
+        if self._file_handlers is not None:
+            open_file_cache.close(self._file_handlers)
+
     def __repr__(self):
         file_handlers = len(self.file_handlers)
         return '{0:s}({1:d})'.format(self.__class__.__name__, file_handlers)
@@ -93,9 +110,10 @@ def processes(self, nr_proc):
 
     @staticmethod
     def _get_variables(file_handler):
-        file_handler.open()
-        var_names = list(file_handler.var_names)
-        file_handler.close()
+        var_names = file_handler.get_cached_var_names()
+        if var_names is None:
+            with open_file_cache.acquire(file_handler) as opened_file:
+                var_names = list(opened_file.var_names)
         return var_names
 
     def _initialize_variables(self):
@@ -111,6 +129,7 @@ def _initialize_variables(self):
                     new_variables[var_name].append(self._file_handlers[key])
                 except KeyError:
                     new_variables[var_name] = [self._file_handlers[key], ]
+        varname_cache.flush()
         return new_variables
 
     @property
@@ -188,6 +207,30 @@ def select_by_pattern(self, pattern, return_list=True, **kwargs):
                     data_list[var] = data
             return data_list
 
+    def _read_all(self, var_name, **kwargs):
+        """
+        Read the data of the given variable from all file handlers, which
+        contain this variable. The file handlers are read concurrently with
+        the set number of processes. The order of the returned data is the
+        same as the order of the file handlers.
+
+        Parameters
+        ----------
+        var_name : str
+            The name of the variable, which should be read.
+        kwargs : dict
+            Additional parameters that are passed to the file handlers.
+
+        Returns
+        -------
+        data : list
+            The flattened list with the read data of all file handlers.
+        """
+        single_func = partial(self._get_file_data, var_name=var_name, **kwargs)
+        data = self._multiproc.map(single_func, self.variables[var_name],
+                                   flatten=True)
+        return data
+
     def select(self, var_name, **kwargs):
         """
         Method to select a variable from this dataset. If the variable is find
@@ -219,9 +262,7 @@ def select(self, var_name, **kwargs):
         num_file_handlers = len(self.variables[var_name])
         logger.info('Started select {0:s} from {1:d} files'.format(
             var_name, num_file_handlers))
-        single_func = partial(self._get_file_data, var_name=var_name, **kwargs)
-        data = self._multiproc.map(single_func, self.variables[var_name],
-                                   flatten=True)
+        data = self._read_all(var_name, **kwargs)
         logger.info('Extracted the data, now merge the data!')
         extracted_data = self.data_merge(data, var_name)
         return extracted_data
@@ -284,10 +325,7 @@ def select_ds(self, include=None, exclude=None, **kwargs):
             num_file_handlers = len(self.variables[var_name])
             logger.info('Started select {0:s} from {1:d} files'.format(
                 var_name, num_file_handlers))
-            single_func = partial(self._get_file_data, var_name=var_name,
-                                  **kwargs)
-            data = self._multiproc.map(single_func, self.variables[var_name],
-                                       flatten=True)
+            data = self._read_all(var_name, **kwargs)
             raw_data.extend(self._multi_select_var(data, var_name))
             logger.info('Finished variable {0:s}'.format(var_name))
         logger.info('Extracted the data, now merge the data!')
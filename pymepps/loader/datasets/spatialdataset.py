@@ -25,14 +25,25 @@
 
 # System modules
 import logging
+import os
 import getpass
 import datetime as dt
 
+# External modules
+import xarray as xr
+
+try:
+    import dask
+except ImportError:
+    dask = None
+
 # Internal modules
 import pymepps
 from pymepps.grid import GridBuilder
 import pymepps.utilities.cdo_funcs as cdo
+from pymepps.loader.filehandler.netcdfhandler import NetCDFHandler
 from .metdataset import MetDataset
+from .filecache import open_file_cache
 
 
 logger = logging.getLogger(__name__)
@@ -159,13 +170,100 @@ def _get_grid_from_str(self, grid_str):
         return grid
 
     def _get_file_data(self, file, var_name, **kwargs):
-        file.open()
-        try:
-            data = file.get_messages(var_name, **kwargs)
-        finally:
-            file.close()
+        with open_file_cache.acquire(file) as opened_file:
+            data = opened_file.get_messages(var_name, **kwargs)
         return data
 
+    def select(self, var_name, lazy=False, **kwargs):
+        """
+        Method to select a variable from this dataset. The data of the files
+        is loaded message-wise and merged, where the newest file is preferred
+        for duplicated coordinates. If lazy is True and all file handlers of
+        the variable are NetCDF handlers, the files are combined with
+        xarray.open_mfdataset instead, see to_xarray.
+
+        Parameters
+        ----------
+        var_name : str
+            The variable which should be extracted. If the variable is not
+            found within the dataset there would be a value error exception.
+        lazy : bool, optional
+            If the files should be combined with xarray.open_mfdataset. If
+            the files overlap or cannot be combined by their coordinates, the
+            data is loaded message-wise. Default is False.
+        kwargs : dict
+            Additional parameters that are passed to the file handlers.
+
+        Returns
+        -------
+        extracted_data : xarray.DataArray or None
+            The DataArray with the data of the selected variable. If None is
+            returned the variable wasn't found within the list with possible
+            variable names.
+        """
+        if lazy and dask is not None and var_name in self.var_names and all(
+                type(fh) is NetCDFHandler for fh in self.variables[var_name]):
+            try:
+                return self.to_xarray(var_name, **kwargs)
+            except (ValueError, TypeError, KeyError) as e:
+                logger.info('The files could not be combined lazily, the data '
+                            'is loaded message-wise: {0:s}'.format(str(e)))
+        return super().select(var_name, **kwargs)
+
+    def to_xarray(self, var_name, chunks=None, **kwargs):
+        """
+        Lazily open the files with the given variable and combine them based
+        on their coordinates with xarray.open_mfdataset. The files are opened
+        in parallel and the data is backed by dask arrays. The coordinates of
+        every file are normalized by its NetCDF handler.
+
+        Parameters
+        ----------
+        var_name : str
+            The variable which should be extracted.
+        chunks : dict or None, optional
+            The dask chunks for every file. If this is None, the chunks of the
+            files are used. Default is None.
+        kwargs : dict
+            Additional parameters that are passed to the coordinate
+            normalization of the file handlers.
+
+        Returns
+        -------
+        extracted_data : xarray.DataArray
+            The combined and dask-backed DataArray with the grid.
+
+        Raises
+        ------
+        ValueError
+            The files overlap, such that they cannot be combined without
+            choosing between duplicated values.
+        """
+        file_handlers = {os.path.abspath(fh.file): fh
+                         for fh in self.variables[var_name]}
+        file_sizes = {}
+
+        def preprocess(ds):
+            path = os.path.abspath(ds.encoding['source'])
+            cube = file_handlers[path].get_messages_from_dataset(
+                ds, var_name, **kwargs)
+            file_sizes[path] = cube.size
+            return cube.to_dataset(name=var_name)
+
+        logger.info('Started lazy select {0:s} from {1:d} files'.format(
+            var_name, len(file_handlers)))
+        ds = xr.open_mfdataset(
+            list(file_handlers.keys()), engine='netcdf4', preprocess=preprocess,
+            combine='by_coords', parallel=self.processes > 1,
+            chunks={} if chunks is None else chunks)
+        merged_array = ds[var_name]
+        if merged_array.size < sum(file_sizes.values()):
+            ds.close()
+            raise ValueError('The files of {0:s} overlap and cannot be '
+                             'combined by their coordinates!'.format(var_name))
+        grid = self.get_grid(var_name, merged_array)
+        return self._set_merged_grid(merged_array, grid, var_name)
+
     def _multi_select_var(self, data, var_name):
         for d in data:
             add_coordinate = d.expand_dims('variable')
@@ -199,15 +297,20 @@ def data_merge(self, data, var_name):
         if len(data) > 1:
             logger.debug('Number of data items: {0:d}'.format(len(data)))
             merged_array = merged_array.pp.update(*data[1:])
+        merged_array = self._set_merged_grid(merged_array, grid, var_name)
+
+        # try:
+        #     merged_array = merged_array.pp.set_grid(grid)
+        # except ValueError:
+        #     pass
+        return merged_array
+
+    @staticmethod
+    def _set_merged_grid(merged_array, grid, var_name):
         loaded_attrs = {attr: merged_array.attrs[attr]
                         for attr in merged_array.attrs
                         if not attr.startswith('ppgrid_')}
         loaded_attrs['name'] = merged_array._name = var_name
         merged_array.attrs = loaded_attrs
         merged_array = merged_array.pp.set_grid(grid)
-
-        # try:
-        #     merged_array = merged_array.pp.set_grid(grid)
-        # except ValueError:
-        #     pass
         return merged_array
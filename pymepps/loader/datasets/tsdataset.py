@@ -31,6 +31,7 @@
 # Internal modules
 import pymepps
 from .metdataset import MetDataset
+from .filecache import open_file_cache
 
 
 logger = logging.getLogger(__name__)
@@ -83,18 +84,15 @@ def _get_lon_lat(self):
                              '{0:s}'.format(str(e)))
         else:
             try:
-                return self.file_handlers[0].lon_lat()
+                return self.file_handlers[0].lon_lat
             except Exception as e:
                 logger.debug('Couldn\'t get lon/lat from first file handler, '
                              'due to {0:s}'.format(str(e)))
                 return None
 
     def _get_file_data(self, file, var_name, **kwargs):
-        file.open()
-        try:
-            ts_data = file.get_timeseries(var_name, **kwargs)
-        finally:
-            file.close()
+        with open_file_cache.acquire(file) as opened_file:
+            ts_data = opened_file.get_timeseries(var_name, **kwargs)
         return ts_data
 
     def _multi_select_var(self, data, var_name):
@@ -109,7 +107,9 @@ def select_by_pattern(self, pattern, return_list=False, **kwargs):
             [pd.DataFrame(l) for l in return_list], pattern)
 
     def data_merge(self, data, var_name):
-        if isinstance(data, (list, tuple)):
+        if isinstance(data, (list, tuple)) and len(data) == 1:
+            merged_data = data[0]
+        elif isinstance(data, (list, tuple)):
             merged_data = data[0]
             merged_data = merged_data.pp.update(*data[1:])
         elif isinstance(data, (pd.Series, pd.DataFrame)):
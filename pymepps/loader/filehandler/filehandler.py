@@ -30,11 +30,13 @@
 import logging
 import datetime
 import collections
+import functools
 
 # External modules
 import xarray as xr
 
 # Internal modules
+from . import varname_cache
 
 
 logger = logging.getLogger(__name__)
@@ -58,10 +60,36 @@ def __init__(self, file_path):
 
     @property
     def var_names(self):
+        if self._var_names is None:
+            self._var_names = self.get_cached_var_names()
         if self._var_names is None:
             self._var_names = self._get_varnames()
+            varname_cache.put(self.file, self.__class__.__name__,
+                              self._var_names)
         return self._var_names
 
+    @property
+    def lon_lat(self):
+        """
+        The position of the file as dict with latitude, longitude and
+        altitude. File types without position information return an empty
+        dict.
+        """
+        return {}
+
+    def get_cached_var_names(self):
+        """
+        Get the variable names of this file from the on-disk variable name
+        cache without opening the file.
+
+        Returns
+        -------
+        var_names : list(str) or None
+            The cached variable names. If the file was not cached or changed
+            since it was cached, None is returned.
+        """
+        return varname_cache.get(self.file, self.__class__.__name__)
+
     @abc.abstractmethod
     def get_messages(self, var_name, **kwargs):
         pass
@@ -79,11 +107,7 @@ def _get_metadata(self):
 
     @staticmethod
     def _check_list_in_list(sublist, check_list):
-        in_list = False
-        for ele in check_list:
-            if [sub for sub in sublist if sub in ele]:
-                in_list = True
-        return in_list
+        return any(sub in ele for ele in check_list for sub in sublist)
 
     def _get_runtime(self, **kwargs):
         if 'runtime' in kwargs:
@@ -123,8 +147,7 @@ def _get_missing_coordinates(self, cube, grid_len=2, **kwargs):
             additional_coords['ensemble'] = self._get_ensemble(**kwargs)
         if not self._check_list_in_list(
                 ['time', 'validtime'], list(cube.dims[:-2])):
-            additional_coords['validtime'] = self._get_validtime(
-                additional_coords, **kwargs)
+            additional_coords['validtime'] = self._get_validtime(**kwargs)
         ds_coords = xr.Dataset(coords=additional_coords)
         cube.coords.update(ds_coords)
         cube = cube.expand_dims(list(additional_coords.keys()))
@@ -153,9 +176,13 @@ def _get_ensemble_from_path(self, path):
                 ens_member = 0
         return ens_member
 
-    def _get_dates_from_path(self, path):
+    @staticmethod
+    @functools.lru_cache(maxsize=1024)
+    def _get_dates_from_path(path):
+        # The dates of a path are parsed once, because the parsing is
+        # requested for every runtime and validtime of every message.
         dates = []
-        path_parts = self._get_path_parts(path)
+        path_parts = FileHandler._get_path_parts(path)
         for part in path_parts:
             if len(part)>5:
                 try:
@@ -170,4 +197,4 @@ def _get_dates_from_path(self, path):
                         date = -9999
                 if date != -9999:
                     dates.append(date)
-        return dates
+        return tuple(dates)
@@ -44,20 +44,46 @@
 
 
 class GribHandler(FileHandler):
+    def __init__(self, file_path):
+        super().__init__(file_path)
+        self._index = None
+
     def open(self):
         if self.ds is None:
             self.ds = pygrib.open(self.file)
         return self
 
     def close(self):
+        if self._index:
+            self._index.close()
+        self._index = None
         if self.ds is not None:
             self.ds.close()
         self.ds = None
 
+    def _select_messages(self, var_name):
+        """
+        Select the messages of the given variable. The messages are looked up
+        with a shortName index of the file, which is built at the first
+        selection and reused for all following selections until the file is
+        closed. If the index cannot be built, all messages are scanned.
+        """
+        if self._index is None:
+            try:
+                self._index = pygrib.index(self.file, 'shortName')
+            except (RuntimeError, OSError, ValueError):
+                self._index = False
+        if self._index is False:
+            return self.ds.select(shortName=var_name)
+        try:
+            return self._index.select(shortName=var_name)
+        except ValueError:
+            return []
+
     def is_type(self):
         try:
             self.open()
-            if len(self.ds[:])==0:
+            if self.ds.messages==0:
                 return_value = False
             else:
                 return_value = True
@@ -87,7 +113,7 @@ def get_messages(self, var_name, **kwargs):
             have six coordinates (analysis, ensemble, time, level, y, x).
             The shape of DataArray are normally (1,1,1,1,y_size,x_size).
         """
-        msgs = self.ds.select(shortName=var_name)
+        msgs = self._select_messages(var_name)
         logger.debug('Selected {0:s} from file {1:s}'.format(var_name,
                                                              self.file))
         data = []
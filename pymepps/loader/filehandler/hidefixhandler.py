@@ -0,0 +1,118 @@
+#!/bin/env python
+# -*- coding: utf-8 -*-
+#
+#Created on 14.10.26
+#
+#Created for pymepps
+#
+#@author: Tobias Sebastian Finn, tobias.sebastian.finn@studium.uni-hamburg.de
+#
+#    Copyright (C) {2026}  {Tobias Sebastian Finn}
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+# System modules
+import logging
+
+# External modules
+
+# Internal modules
+from .netcdfhandler import NetCDFHandler
+
+
+logger = logging.getLogger(__name__)
+
+
+_HIDEFIX_ERRORS = (ValueError, OSError, RuntimeError, NotImplementedError)
+
+
+class HidefixHandler(NetCDFHandler):
+    """
+    File handler for NetCDF4/HDF5 files, which are read with the hidefix
+    backend of xarray. The hidefix reader decodes the chunks of a variable
+    concurrently without the global lock of the HDF5 library. If the hidefix
+    package is not installed or if a file or variable cannot be decoded by
+    hidefix, e.g. due to an unsupported compression, the file is read with
+    the netcdf4 engine.
+
+    The number of threads used by hidefix could be set with the
+    RAYON_NUM_THREADS environment variable.
+
+    Parameters
+    ----------
+    file_path : str
+        The path to the file, which should be opened.
+    chunks : dict, bool or None, optional
+        The chunks, which are used to open the file as dask-backed dataset.
+        If this is None, the chunks of the variables on disk are used if dask
+        is installed. If this is False, the file is opened without dask.
+        Default is None.
+    """
+    def __init__(self, file_path, chunks=None):
+        super().__init__(file_path, chunks=chunks)
+        self._engine = 'hidefix'
+
+    @property
+    def engine(self):
+        return self._engine
+
+    def open(self):
+        if self.ds is None:
+            if self._engine == 'hidefix':
+                try:
+                    self.ds = self._open_dataset('hidefix')
+                except (ImportError, ) + _HIDEFIX_ERRORS as e:
+                    self._fallback(e)
+            if self.ds is None:
+                self.ds = self._open_dataset('netcdf4')
+        return self
+
+    def _fallback(self, error):
+        logger.warning(
+            'The file {0:s} could not be read with hidefix, the netcdf4 engine '
+            'is used instead: {1:s}'.format(str(self.file), str(error)))
+        self.close()
+        self._engine = 'netcdf4'
+
+    def _read_with_fallback(self, read_func, var_name, **kwargs):
+        """
+        Read the variable with the given read function. The values of a
+        variable are decoded when they are read, such that the file is
+        reopened with the netcdf4 engine if hidefix fails to decode them.
+        """
+        try:
+            return read_func(var_name, **kwargs)
+        except _HIDEFIX_ERRORS as e:
+            if self._engine != 'hidefix':
+                raise e
+            self._fallback(e)
+            self.open()
+            return read_func(var_name, **kwargs)
+
+    def get_timeseries(self, var_name, **kwargs):
+        return self._read_with_fallback(super().get_timeseries, var_name,
+                                        **kwargs)
+
+    def _load_messages(self, var_name, **kwargs):
+        messages = super().get_messages(var_name, **kwargs)
+        if self._engine == 'hidefix':
+            # The values are read here, such that decoding errors are caught,
+            # without loading them into the opened dataset
+            messages = messages.compute()
+        return messages
+
+    def get_messages(self, var_name, **kwargs):
+        return self._read_with_fallback(self._load_messages, var_name,
+                                        **kwargs)
@@ -0,0 +1,75 @@
+#!/bin/env python
+# -*- coding: utf-8 -*-
+#
+#Created on 14.10.26
+#
+#Created for pymepps
+#
+#@author: Tobias Sebastian Finn, tobias.sebastian.finn@studium.uni-hamburg.de
+#
+#    Copyright (C) {2026}  {Tobias Sebastian Finn}
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+# System modules
+import logging
+
+# External modules
+
+# Internal modules
+from .netcdfhandler import NetCDFHandler
+
+
+logger = logging.getLogger(__name__)
+
+
+class InMemoryHandler(NetCDFHandler):
+    """
+    File handler for an already loaded xarray.Dataset, e.g. the result of a
+    cdo operator, which is returned without an intermediate output file. The
+    handler behaves like a NetCDFHandler, but opening and closing the handler
+    does not touch the file system.
+
+    Parameters
+    ----------
+    dataset : xarray.Dataset
+        The loaded dataset of this handler.
+    file_path : str or None, optional
+        The path of the original file. This path is used to infer the
+        runtime, validtime and ensemble member, if the dataset has not these
+        coordinates. Default is None.
+    """
+    def __init__(self, dataset, file_path=None):
+        super().__init__(file_path)
+        self._dataset = dataset
+
+    def open(self):
+        self.ds = self._dataset
+        return self
+
+    def close(self):
+        self.ds = None
+
+    @property
+    def var_names(self):
+        if self._var_names is None:
+            self._var_names = self._get_varnames()
+        return self._var_names
+
+    def is_type(self):
+        return True
+
+    def get_cached_var_names(self):
+        return None
@@ -24,10 +24,22 @@
 # """
 # System modules
 import logging
+import threading
+from contextlib import contextmanager
 
 # External modules
 import xarray as xr
 import numpy as np
+import pandas as pd
+
+try:
+    import bottleneck as bn
+except ImportError:
+    bn = None
+try:
+    import dask
+except ImportError:
+    dask = None
 
 # Internal modules
 from .filehandler import FileHandler
@@ -36,7 +48,103 @@
 logger = logging.getLogger(__name__)
 
 
+_MASK_BUFFER = threading.local()
+
+
+def _mask_buffer(shape):
+    """
+    Get a boolean scratch array with the given shape. The scratch memory is
+    reused by all masks of the same thread and is only enlarged if a larger
+    mask is needed.
+    """
+    size = int(np.prod(shape))
+    buffer = getattr(_MASK_BUFFER, 'buffer', None)
+    if buffer is None or buffer.size < size:
+        buffer = np.empty(size, dtype=bool)
+        _MASK_BUFFER.buffer = buffer
+    return buffer[:size].reshape(shape)
+
+
+def _replace_fill(values, fill_value):
+    """
+    Replace the given fill value by NaN within the given array in-place. If
+    bottleneck is installed, the values are compared and replaced in a single
+    pass without a temporary mask. Else the mask is written into a reused
+    scratch array. Arrays, which cannot hold NaN, are returned unchanged.
+    """
+    if values.dtype.kind not in 'fc':
+        return values
+    fill_value = values.dtype.type(fill_value)
+    if bn is not None and values.dtype.kind == 'f':
+        bn.replace(values, fill_value, np.nan)
+    else:
+        fill_mask = _mask_buffer(values.shape)
+        np.equal(values, fill_value, out=fill_mask)
+        np.copyto(values, np.nan, where=fill_mask)
+    return values
+
+
+def _masked_values(values, fill_value):
+    values = np.asarray(values)
+    if not values.flags.writeable:
+        values = values.copy()
+    return _replace_fill(values, fill_value)
+
+
+def _mask_fill(variable, fill_value):
+    """
+    Replace the given fill value by NaN within the given variable. The mask
+    of a dask-backed variable is only a graph operation, such that only the
+    read slices are masked. Other variables are loaded and masked in-place.
+    """
+    if variable.dtype.kind not in 'fc':
+        return variable
+    fill_value = variable.dtype.type(fill_value)
+    if variable.chunks is not None:
+        return variable.where(variable != fill_value)
+    return variable.copy(
+        deep=False, data=_masked_values(variable.values, fill_value))
+
+
+def _load_variable(ds, var_name):
+    """
+    Get the variable with the given name from the given dataset, where fill
+    values, which are not decoded by xarray, are replaced by NaN.
+    """
+    variable = ds[var_name]
+    if hasattr(variable, '_FillValue'):
+        fill_value = variable._FillValue
+    elif hasattr(variable, 'missing_value'):
+        fill_value = variable.missing_value
+    else:
+        fill_value = 9.96921e+36
+    return _mask_fill(variable, fill_value)
+
+
+def _chunk_like_disk(ds):
+    """
+    Chunk the data variables of the given dataset with their chunk sizes on
+    disk. Contiguous variables are used as single chunk.
+    """
+    chunked_vars = {}
+    for name, var in ds.data_vars.items():
+        chunksizes = var.encoding.get('chunksizes')
+        if chunksizes is None or var.encoding.get('contiguous', False):
+            chunked_vars[name] = var.chunk({})
+        else:
+            chunked_vars[name] = var.chunk(dict(zip(var.dims, chunksizes)))
+    chunked_ds = ds.assign(chunked_vars)
+    chunked_ds.set_close(ds.close)
+    return chunked_ds
+
+
 def cube_to_series(cube, var_name):
+    """
+    Convert the given cube into a pandas object with the time as index. If
+    the cube has additional dimensions, a DataFrame is returned, where the
+    columns are a MultiIndex of these dimensions. The values are reshaped
+    in bulk without stacking the cube.
+    """
     cleaned_dims = list(cube.dims)
     if 'index' in cleaned_dims:
         cleaned_dims.remove('index')
@@ -44,9 +152,16 @@ def cube_to_series(cube, var_name):
         cleaned_dims.remove('time')
     elif 'validtime' in cleaned_dims:
         cleaned_dims.remove('validtime')
-    if cleaned_dims:
-        stacked = cube.stack(col=cleaned_dims)
-        data = stacked.to_pandas()
+    if len(cleaned_dims) == cube.ndim:
+        data = cube.stack(col=cleaned_dims).to_pandas()
+    elif cleaned_dims:
+        time_dim = [dim for dim in cube.dims if dim not in cleaned_dims]
+        values = cube.transpose(*time_dim, *cleaned_dims).values
+        columns = pd.MultiIndex.from_product(
+            [cube.get_index(dim) for dim in cleaned_dims], names=cleaned_dims)
+        data = pd.DataFrame(
+            values.reshape(values.shape[0], -1),
+            index=cube.get_index(time_dim[0]), columns=columns)
     else:
         data = cube.to_series()
         data.name = var_name
@@ -54,8 +169,54 @@ def cube_to_series(cube, var_name):
 
 
 class NetCDFHandler(FileHandler):
+    def __init__(self, file_path, chunks=None):
+        """
+        File handler for NetCDF files. If dask is installed, the files are
+        opened as dask-backed datasets with the chunks of the variables on
+        disk, such that only the chunks of the selected slices are read.
+
+        Parameters
+        ----------
+        file_path : str
+            The path to the file, which should be opened.
+        chunks : dict, bool or None, optional
+            The chunks, which are used to open the file as dask-backed
+            dataset. If this is None, the chunks of the variables on disk are
+            used if dask is installed. If this is False, the file is opened
+            without dask. Default is None.
+        """
+        super().__init__(file_path)
+        self.chunks = chunks
+        self._lon_lat = None
+
+    def _open_dataset(self, engine):
+        if self.chunks is None or self.chunks is False:
+            # The file might be kept open in the file cache, such that the
+            # read values should not be cached within the opened dataset
+            ds = xr.open_dataset(self.file, engine=engine, cache=False)
+            if self.chunks is None and dask is not None:
+                ds = _chunk_like_disk(ds)
+        else:
+            ds = xr.open_dataset(self.file, engine=engine, chunks=self.chunks)
+        return ds
+
+    @contextmanager
+    def _opened(self):
+        """
+        Context manager, which opens the file if it is not already opened.
+        The file is only closed afterwards if it was opened by this context.
+        """
+        was_closed = self.ds is None
+        self.open()
+        try:
+            yield self
+        finally:
+            if was_closed:
+                self.close()
+
     def _get_varnames(self):
-        var_names = list(self.ds.data_vars)
+        with self._opened():
+            var_names = list(self.ds.data_vars)
         return var_names
 
     def is_type(self):
@@ -68,7 +229,7 @@ def is_type(self):
 
     def open(self):
         if self.ds is None:
-            self.ds = xr.open_dataset(self.file, engine='netcdf4')
+            self.ds = self._open_dataset('netcdf4')
         return self
 
     def close(self):
@@ -78,25 +239,34 @@ def close(self):
 
     @property
     def lon_lat(self):
+        """
+        The position of the file as dict with latitude, longitude and
+        altitude. The position is read only once and is then cached.
+        """
+        if self._lon_lat is None:
+            with self._opened():
+                self._lon_lat = self._get_lon_lat()
+        return self._lon_lat
+
+    def _get_lon_lat(self):
         attrs = {}
-        try:
-            attrs['latitude'] = float(self.ds.lat.values)
-        except TypeError or KeyError:
-            pass
-        try:
-            attrs['longitude'] = float(self.ds.lon.values)
-        except TypeError or KeyError:
-            pass
-        try:
-            attrs['altitude'] = float(self.ds.zsl.values)
-        except TypeError or KeyError:
-            pass
+        position_vars = (('latitude', 'lat'), ('longitude', 'lon'),
+                         ('altitude', 'zsl'))
+        for key, var_name in position_vars:
+            if var_name not in self.ds.variables:
+                continue
+            try:
+                attrs[key] = float(self.ds[var_name].values)
+            except (TypeError, ValueError):
+                pass
         return attrs
 
     def load_cube(self, var_name):
         """
         Method to load a variable from the netcdf file and return it as
-        xr.DataArray.
+        xr.DataArray. Fill values, which are not decoded by xarray, are
+        replaced by NaN. The values of a dask-backed variable are not loaded
+        and are masked when they are read.
 
         Parameters
         ----------
@@ -108,14 +278,7 @@ def load_cube(self, var_name):
         variable : xr.DataArray
             The DataArray of the variable.
         """
-        variable = self.ds[var_name]
-        if hasattr(variable, '_FillValue'):
-            variable.values[variable.values == variable._FillValue] = np.nan
-        elif hasattr(variable, 'missing_value'):
-            variable.values[variable.values == variable.missing_value] = np.nan
-        else:
-            variable.values[variable.values==9.96921e+36] = np.nan
-        return variable
+        return _load_variable(self.ds, var_name)
 
     def get_timeseries(self, var_name, **kwargs):
         """
@@ -140,7 +303,10 @@ def get_timeseries(self, var_name, **kwargs):
 
     def get_messages(self, var_name, **kwargs):
         """
-        Method to imitate the message-like behaviour of grib files.
+        Method to imitate the message-like behaviour of grib files. The
+        variable is not split into single messages, but is returned as one
+        DataArray with normalized coordinates, such that it is merged in a
+        single step with the data of other files.
 
         Parameters
         ----------
@@ -161,16 +327,43 @@ def get_messages(self, var_name, **kwargs):
 
         Returns
         -------
-        data : list of xr.DataArray
-            The list with the message-wise data as DataArray. The DataArray
-            have six coordinates (analysis, ensemble, time, level, y, x).
-            The shape of DataArray are normally (1,1,1,1,y_size,x_size).
+        data : xr.DataArray
+            The data of the variable as DataArray. The DataArray has the
+            normalized coordinates (runtime, ensemble, validtime, height) and
+            the grid coordinates. If the file is opened with dask, the
+            DataArray is dask-backed and its values are read when they are
+            loaded.
+        """
+        return self.get_messages_from_dataset(self.ds, var_name, **kwargs)
+
+    def get_messages_from_dataset(self, ds, var_name, **kwargs):
+        """
+        Get the variable from the given dataset of this file and normalize it
+        in the same way as get_messages. This is used if the file is opened
+        outside of this handler, e.g. by xarray.open_mfdataset.
+
+        Parameters
+        ----------
+        ds : xr.Dataset
+            The opened dataset of this file.
+        var_name : str
+            The variable name, which should be extracted.
+        kwargs : dict
+            The additional parameters of get_messages.
+
+        Returns
+        -------
+        data : xr.DataArray
+            The data of the variable as DataArray with normalized coordinates.
         """
-        cube = self.load_cube(var_name)
+        cube = _load_variable(ds, var_name)
         if 'sliced_coords' in kwargs:
             cube = cube[(...,)+kwargs['sliced_coords']]
-        cube.attrs.update(self.ds.attrs)
-        cube = cube.load()
+        cube.attrs.update(ds.attrs)
+        # A dask-backed cube is normalized and returned lazily, such that the
+        # expanded dimensions are only graph operations
+        if cube.chunks is None:
+            cube = cube.load()
         cube = cube.pp.normalize_coords(
             runtime=self._get_runtime(**kwargs),
             ensemble=self._get_ensemble(**kwargs),
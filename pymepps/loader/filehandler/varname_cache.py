@@ -0,0 +1,177 @@
+#!/bin/env python
+# -*- coding: utf-8 -*-
+#
+#Created on 14.10.26
+#
+#Created for pymepps
+#
+#@author: Tobias Sebastian Finn, tobias.sebastian.finn@studium.uni-hamburg.de
+#
+#    Copyright (C) {2026}  {Tobias Sebastian Finn}
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+"""
+On-disk cache of the variable names of files. The variable names are stored
+per directory within a json-based index file, which is keyed by the file
+name, the file handler type, the modification time and the size of the file,
+such that changed files are detected and scanned again. If the index file
+cannot be read or written, e.g. due to missing permissions, the cache is
+silently skipped. The cache could be disabled by setting the environment
+variable PYMEPPS_VARNAME_CACHE to 0.
+"""
+
+# System modules
+import logging
+import os
+import json
+import threading
+import atexit
+
+# External modules
+
+# Internal modules
+
+
+logger = logging.getLogger(__name__)
+
+INDEX_NAME = '.pymepps_idx.json'
+
+_LOCK = threading.Lock()
+_INDEXES = {}
+_PENDING = {}
+
+
+def _enabled():
+    return os.environ.get('PYMEPPS_VARNAME_CACHE', '1') != '0'
+
+
+def _file_key(path, handler_name):
+    """
+    Get the index path, the file key and the file stamp for the given path.
+    Returns None if the path is not an existing local file.
+    """
+    if not isinstance(path, str) or not _enabled():
+        return None
+    try:
+        file_stat = os.stat(path)
+    except (OSError, ValueError):
+        return None
+    abs_path = os.path.abspath(path)
+    index_path = os.path.join(os.path.dirname(abs_path), INDEX_NAME)
+    file_key = '{0:s}:{1:s}'.format(handler_name, os.path.basename(abs_path))
+    file_stamp = [file_stat.st_mtime_ns, file_stat.st_size]
+    return index_path, file_key, file_stamp
+
+
+def _read_index(index_path):
+    try:
+        with open(index_path, mode='r') as fp:
+            index = json.load(fp)
+    except (OSError, ValueError):
+        index = {}
+    if not isinstance(index, dict):
+        index = {}
+    return index
+
+
+def get(path, handler_name):
+    """
+    Get the cached variable names of the given file.
+
+    Parameters
+    ----------
+    path : str
+        The path to the file.
+    handler_name : str
+        The name of the file handler type, which has read the variable names.
+
+    Returns
+    -------
+    var_names : list(str) or None
+        The cached variable names. If the file is not cached or if the file
+        was changed, None is returned.
+    """
+    key = _file_key(path, handler_name)
+    if key is None:
+        return None
+    index_path, file_key, file_stamp = key
+    with _LOCK:
+        if index_path not in _INDEXES:
+            _INDEXES[index_path] = _read_index(index_path)
+        entry = _INDEXES[index_path].get(file_key)
+    if not isinstance(entry, dict) or entry.get('stamp') != file_stamp:
+        return None
+    logger.debug('Found cached variable names for {0:s}'.format(path))
+    return list(entry['var_names'])
+
+
+def put(path, handler_name, var_names):
+    """
+    Store the variable names of the given file. The variable names are only
+    written to the index file of its directory with :py:func:`flush`, such
+    that the index file is written once for many files.
+
+    Parameters
+    ----------
+    path : str
+        The path to the file.
+    handler_name : str
+        The name of the file handler type, which has read the variable names.
+    var_names : iterable(str)
+        The variable names of the file.
+    """
+    key = _file_key(path, handler_name)
+    if key is None:
+        return
+    index_path, file_key, file_stamp = key
+    entry = dict(stamp=file_stamp, var_names=[str(v) for v in var_names])
+    with _LOCK:
+        if index_path not in _INDEXES:
+            _INDEXES[index_path] = _read_index(index_path)
+        _INDEXES[index_path][file_key] = entry
+        _PENDING.setdefault(index_path, {})[file_key] = entry
+
+
+def _write_index(index_path, index):
+    tmp_path = '{0:s}.{1:d}.tmp'.format(index_path, os.getpid())
+    try:
+        with open(tmp_path, mode='w') as fp:
+            json.dump(index, fp)
+        os.replace(tmp_path, index_path)
+    except OSError as e:
+        logger.debug('Could not write the variable name index {0:s}: '
+                     '{1:s}'.format(index_path, str(e)))
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+
+def flush():
+    """
+    Write the stored variable names to the index files. Every index file is
+    read again before it is written, such that entries written by other
+    processes are kept. This is called automatically at exit.
+    """
+    with _LOCK:
+        for index_path, entries in _PENDING.items():
+            index = _read_index(index_path)
+            index.update(entries)
+            _INDEXES[index_path] = index
+            _write_index(index_path, index)
+        _PENDING.clear()
+
+
+atexit.register(flush)
@@ -25,6 +25,7 @@
 
 # System modules
 import logging
+import os
 
 # Internal modules
 from .base import BaseLoader
@@ -32,6 +33,7 @@
 from .filehandler.netcdfhandler import NetCDFHandler
 from .filehandler.gribhandler import GribHandler
 from .filehandler.opendaphandler import OpendapHandler
+from .filehandler.hidefixhandler import HidefixHandler
 
 # External modules
 
@@ -60,6 +62,9 @@ class ModelLoader(BaseLoader):
             grib2: Grib2 files
             grib1: Grib1 files
             dap: Opendap urls
+            hidefix: NetCDF4/HDF5 files read with the hidefix backend. The
+                number of hidefix threads is set to the number of processes
+                if RAYON_NUM_THREADS is not set.
     grid : str or Grid or None, optional
         The grid describes the horizontal grid of the spatial data. The given 
         grid will be forwarded to the given SpatialDataset instance. Default is
@@ -74,7 +79,10 @@ def __init__(self, data_path, file_type=None, grid=None, processes=1,
             'grib2': GribHandler,
             'grib1': GribHandler,
             'dap': OpendapHandler,
+            'hidefix': HidefixHandler,
         }
+        if self.file_type == 'hidefix' and self.processes > 1:
+            os.environ.setdefault('RAYON_NUM_THREADS', str(self.processes))
 
     def _convert_filehandlers_to_dataset(self, file_handlers):
         ds = SpatialDataset(file_handlers, self.grid, data_origin=self,
@@ -0,0 +1,88 @@
+#!/bin/env python
+# -*- coding: utf-8 -*-
+#
+#Created on 14.10.26
+#
+#Created for pymepps
+#
+#@author: Tobias Sebastian Finn, tobias.sebastian.finn@studium.uni-hamburg.de
+#
+#    Copyright (C) {2026}  {Tobias Sebastian Finn}
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+"""
+Numba-compiled kernels for the rank histogram. This module needs numba and
+raises an ImportError if numba is not installed.
+"""
+
+# System modules
+import logging
+
+# External modules
+import numpy as np
+from numba import njit, prange
+
+# Internal modules
+
+
+logger = logging.getLogger(__name__)
+
+# The fused kernel avoids the temporary boolean array of numpy, but its first
+# call needs to be compiled, such that it is only used for large ensembles.
+MIN_VALUES = 2**20
+
+
+@njit(parallel=True, cache=True)
+def _count_kernel(ens, truth, out):
+    for j in prange(ens.shape[0]):
+        t = truth[j]
+        if np.isnan(t):
+            out[j] = np.nan
+        else:
+            cnt = 0
+            for i in range(ens.shape[1]):
+                cnt += ens[j, i] < t
+            out[j] = cnt
+
+
+def use_kernel(values):
+    """
+    Check if the parallel kernel should be used for the given number of
+    ensemble values.
+    """
+    return values >= MIN_VALUES
+
+
+def count_lower(ens, truth):
+    """
+    Count the number of ensemble members, which are lower than the truth.
+
+    Parameters
+    ----------
+    ens : numpy.ndarray
+        The ensemble values with the shape (times, members) as C-contiguous
+        float64 array.
+    truth : numpy.ndarray
+        The truth values with the shape (times, ) as float64 array.
+
+    Returns
+    -------
+    ranks : numpy.ndarray
+        The number of lower members for every time as float64 array. The rank
+        is NaN if the truth is NaN.
+    """
+    out = np.empty(ens.shape[0], dtype=np.float64)
+    _count_kernel(ens, truth, out)
+    return out
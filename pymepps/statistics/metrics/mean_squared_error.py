@@ -27,6 +27,7 @@
 import logging
 
 # External modules
+import numpy as np
 
 # Internal modules
 from .error import ErrorMetric
@@ -42,7 +43,16 @@ class MeanSquaredError(ErrorMetric):
     """
     def _calc_metric(self, X=None, y=None):
         error_array = self._calc_error()
-        mse = (error_array ** 2).mean(dim=self.iterate_axis)
+        # The error array is only used here, such that in-memory errors are
+        # squared in-place. Dask-backed errors are squared lazily, because
+        # their values are only a computed copy.
+        for name, error_var in list(error_array.data_vars.items()):
+            if isinstance(error_var.data, np.ndarray):
+                np.square(error_var.data, out=error_var.data)
+            else:
+                error_array[name] = error_var ** 2
+        # The mean of float data already skips missing errors by default
+        mse = error_array.mean(dim=self.iterate_axis)
         return mse
 
 
@@ -27,10 +27,16 @@
 import logging
 
 # External modules
+import numpy as np
 import pandas as pd
 
 # Internal modules
-from pymepps.metdata import TSData
+import pymepps
+try:
+    from ._rank_numba import count_lower, use_kernel
+except ImportError:
+    count_lower = None
+    use_kernel = None
 
 
 logger = logging.getLogger(__name__)
@@ -52,16 +58,20 @@ def rank_hist(ens_ts, truth_ts):
     Returns
     -------
     rank_ts : pandas.Series
-        The rank as pandas.Series with the valid times as time axis.
+        The rank as pandas.Series with the valid times as time axis. The rank
+        is the number of ensemble members, which are lower than the truth. If
+        there is no truth for a valid time, the rank is NaN.
     """
-    rank_hist_values = ens_ts.T
-    # Trick to get values if the truth is lower than the lowest ensemble member
-    rank_hist_values.loc[0, :] = 0
-    rank_hist_values = rank_hist_values.sort_index()
-    rank_ts = pd.Series({col: rank_hist_values.index[
-                truth_ts.loc[col] > rank_hist_values.loc[:, col]].max()
-            for col in rank_hist_values.columns})
-    rank_ts = TSData(rank_ts, 'rank_hist', lonlat=truth_ts.lonlat)
+    ens_values = ens_ts.to_numpy(dtype=float)
+    truth_values = truth_ts.reindex(ens_ts.index).to_numpy(dtype=float)
+    if count_lower is not None and use_kernel(ens_values.size):
+        ranks = count_lower(np.ascontiguousarray(ens_values), truth_values)
+    else:
+        ranks = np.count_nonzero(ens_values < truth_values[:, np.newaxis],
+                                 axis=1)
+        ranks = np.where(np.isnan(truth_values), np.nan, ranks)
+    rank_ts = pd.Series(ranks, index=ens_ts.index, name='rank_hist')
+    rank_ts.pp.lonlat = truth_ts.pp.lonlat
     return rank_ts
 
 
@@ -84,9 +94,13 @@ def rank_hist_wo_bias(ens_ts, truth_ts):
     rank_ts : pandas.Series
         The rank as pandas.Series with the valid times as time axis.
     """
-    ens_ts = ens_ts.copy()
-    bias_df = pd.DataFrame(
-        {'chh': ens_ts.T.mean(), 'obs': truth_ts}).dropna().mean()
-    bias = bias_df['chh'] - bias_df['obs']
-    ens_ts = ens_ts-bias
+    ens_mean = ens_ts.mean(axis=1).to_numpy(dtype=float)
+    truth_values = truth_ts.reindex(ens_ts.index).to_numpy(dtype=float)
+    valid = ~(np.isnan(ens_mean) | np.isnan(truth_values))
+    bias = ens_mean[valid].mean() - truth_values[valid].mean()
+    # The bias is subtracted in-place from a single copy of the ensemble
+    ens_values = ens_ts.to_numpy(dtype=float, copy=True)
+    ens_values -= bias
+    ens_ts = pd.DataFrame(ens_values, index=ens_ts.index,
+                          columns=ens_ts.columns)
     return rank_hist(ens_ts, truth_ts)
\ No newline at end of file
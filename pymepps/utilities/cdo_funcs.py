@@ -29,16 +29,6 @@
 from functools import partial
 
 # External modules
-CDO = None
-try:
-    from cdo import Cdo
-    CDO = Cdo()
-except ImportError:
-    print('For full support please install the cdo package via '
-          '"pip install cdo"')
-except FileNotFoundError:
-    print('For full support please install cdo see more at: '
-          '"https://code.mpimet.mpg.de/projects/cdo/wiki/Cdo#Documentation"')
 
 # Internal modules
 from pymepps.utilities.file import File
@@ -48,92 +38,196 @@
 
 logger = logging.getLogger(__name__)
 
+_CDO = None
+_CDO_INITIALIZED = False
+
+
+def get_cdo():
+    """
+    Get the cdo instance. The instance is created at the first call, because
+    the initialization of the cdo bindings calls the cdo binary.
+
+    Returns
+    -------
+    cdo : cdo.Cdo or None
+        The cdo instance. This is None if the cdo bindings or the cdo binary
+        are not installed.
+    """
+    global _CDO, _CDO_INITIALIZED
+    if not _CDO_INITIALIZED:
+        _CDO_INITIALIZED = True
+        try:
+            from cdo import Cdo
+            _CDO = Cdo()
+        except ImportError:
+            print('For full support please install the cdo package via '
+                  '"pip install cdo"')
+        except FileNotFoundError:
+            print('For full support please install cdo see more at: '
+                  '"https://code.mpimet.mpg.de/projects/cdo/wiki/Cdo'
+                  '#Documentation"')
+    return _CDO
+
+
+def _cdo_options(options=None, cdo_threads=None):
+    """
+    Build the option string for a cdo call.
+
+    Parameters
+    ----------
+    options : str or None, optional
+        Additional cdo options. Default is None.
+    cdo_threads : int or None, optional
+        The number of OpenMP threads used by every cdo call (``-P``). If None,
+        the cdo default is used. Default is None.
+
+    Returns
+    -------
+    options_str : str
+        The option string, which is passed to the cdo bindings.
+    """
+    options_list = []
+    if isinstance(cdo_threads, int) and cdo_threads > 1:
+        options_list.append('-P {0:d}'.format(cdo_threads))
+    if isinstance(options, str):
+        options_list.append(options)
+    return ' '.join(options_list)
+
+
+def _split_file_handlers(file_handlers, new_path=None, inplace=False,
+                         pipe=False):
+    """
+    Split the file handlers into handlers, which need to be processed by cdo
+    and handlers, which could be used as they are, because their output file
+    exists already or the output file would overwrite the input file. If pipe
+    is True and inplace is False, all file handlers are processed without
+    output file.
+
+    Returns
+    -------
+    tasks : list(tuple)
+        The cdo tasks as tuple of file handler, input file and output file.
+    new_file_handlers : list(FileHandler or None)
+        The file handlers in the order of the given file handlers. The
+        handlers, which need to be processed, are None and have to be replaced
+        with :py:func:`_fill_file_handlers`.
+    """
+    tasks = []
+    new_file_handlers = []
+    for fh in file_handlers:
+        in_file, out_file = cdo_path_helper(file_path=fh.file,
+                                            new_path=new_path,
+                                            inplace=inplace)
+        if pipe and not inplace:
+            tasks.append((fh, in_file, None))
+            new_file_handlers.append(None)
+        elif not os.path.isfile(out_file) and in_file != out_file:
+            tasks.append((fh, in_file, out_file))
+            new_file_handlers.append(None)
+        else:
+            new_file_handlers.append(fh)
+    return tasks, new_file_handlers
+
+
+def _fill_file_handlers(new_file_handlers, processed_handlers):
+    """
+    Replace the pending file handlers with the processed file handlers, such
+    that the input order of the file handlers is kept.
+    """
+    processed_handlers = iter(processed_handlers)
+    return [next(processed_handlers) if fh is None else fh
+            for fh in new_file_handlers]
+
+
+def _cdo_input(in_file, in_opt=None):
+    if isinstance(in_opt, str):
+        return in_opt.replace('%FILE%', in_file)
+    return in_file
+
+
+def _cdo_output(out_file, options=''):
+    """
+    Get the output keywords and options for a cdo call. Without output file
+    the result is returned as xarray.Dataset, which is saved as NetCDF if no
+    output format is given.
+    """
+    if out_file is not None:
+        return dict(output=out_file, options=options)
+    if '-f ' not in options:
+        options = ' '.join(['-f nc', options]).strip()
+    return dict(returnXDataset=True, options=options)
+
+
+def _new_file_handler(fh, out_file, cdo_result):
+    if out_file is None:
+        from pymepps.loader.filehandler.memoryhandler import InMemoryHandler
+        return InMemoryHandler(cdo_result.load(), fh.file)
+    return fh.__class__(out_file)
+
 
 def selnearest(ds, lonlat, new_path=None, inplace=False, in_opt=None,
-               options=None, processes=1):
-    logger.info('Started selnearest for {0:d} files'.format(
-        len(ds.file_handlers)))
+               options=None, processes=1, cdo_threads=None, pipe=False):
+    tasks, new_file_handlers = _split_file_handlers(
+        ds.file_handlers, new_path=new_path, inplace=inplace, pipe=pipe)
+    logger.info('Started selnearest for {0:d} files'.format(len(tasks)))
     multiproc = MultiThread(processes)
     single_fh_func = partial(
         _single_fh_selnearest,
         lonlat=lonlat,
-        new_path=new_path,
-        inplace=inplace,
         in_opt=in_opt,
-        options=options)
-    new_file_handlers = multiproc.map(single_fh_func, ds.file_handlers)
-    logger.info('Finished sellonlatbox')
+        options=_cdo_options(options, cdo_threads))
+    if tasks:
+        new_file_handlers = _fill_file_handlers(
+            new_file_handlers,
+            multiproc.map(single_fh_func, tasks, flatten=False))
+    logger.info('Finished selnearest')
     return new_file_handlers
 
 
-def _single_fh_selnearest(fh, lonlat, new_path=None, inplace=False,
-                          in_opt=None, options=None):
-    in_file, out_file = cdo_path_helper(file_path=fh.file,
-                                        new_path=new_path,
-                                        inplace=inplace)
-    options_str = ''
-    if isinstance(options, str):
-        options_str = options
-    input_str = in_file
-    if isinstance(in_opt, str):
-        input_str = in_opt.replace('%FILE%', in_file)
-    if not os.path.isfile(out_file) and in_file!=out_file:
-        CDO.remapnn(
-            'lon={0:.4f}_lat={1:.4f}'.format(lonlat[0], lonlat[1]),
-            input=input_str,
-            output=out_file,
-            options=options_str)
-        new_fh = fh.__class__(out_file)
-    else:
-        new_fh = fh
-    return new_fh
+def _single_fh_selnearest(task, lonlat, in_opt=None, options=''):
+    fh, in_file, out_file = task
+    cdo_result = get_cdo().remapnn(
+        'lon={0:.4f}_lat={1:.4f}'.format(lonlat[0], lonlat[1]),
+        input=_cdo_input(in_file, in_opt),
+        **_cdo_output(out_file, options))
+    return _new_file_handler(fh, out_file, cdo_result)
 
 
 def sellonlatbox(ds, lonlatbox, new_path=None, inplace=False, in_opt=None,
-                 options=None, processes=1):
-        logger.info('Started sellonlatbox for {0:d} files'.format(
-            len(ds.file_handlers)))
-        multiproc = MultiThread(processes)
-        single_fh_func = partial(
-            _single_fh_sellonlatbox,
-            lonlatbox=lonlatbox,
-            new_path=new_path,
-            inplace=inplace,
-            in_opt=in_opt,
-            options=options)
-        new_file_handlers = multiproc.map(single_fh_func, ds.file_handlers)
-        logger.info('Finished sellonlatbox')
-        return new_file_handlers
-
-
-def _single_fh_sellonlatbox(fh, lonlatbox, new_path=None, inplace=False,
-                            in_opt=None, options=None):
-        in_file, out_file = cdo_path_helper(file_path=fh.file,
-                                            new_path=new_path,
-                                            inplace=inplace)
-        options_str = ''
-        if isinstance(options, str):
-            options_str = options
-        input_str = in_file
-        if isinstance(in_opt, str):
-            input_str = in_opt.replace('%FILE%', in_file)
-        if not os.path.isfile(out_file) and in_file!=out_file:
-            CDO.sellonlatbox(
-                lonlatbox[0],
-                lonlatbox[2],
-                lonlatbox[3],
-                lonlatbox[1],
-                input=input_str,
-                options=options_str)
-            new_fh = fh.__class__(out_file)
-        else:
-            new_fh = fh
-        return new_fh
+                 options=None, processes=1, cdo_threads=None, pipe=False):
+    tasks, new_file_handlers = _split_file_handlers(
+        ds.file_handlers, new_path=new_path, inplace=inplace, pipe=pipe)
+    logger.info('Started sellonlatbox for {0:d} files'.format(len(tasks)))
+    multiproc = MultiThread(processes)
+    single_fh_func = partial(
+        _single_fh_sellonlatbox,
+        lonlatbox=lonlatbox,
+        in_opt=in_opt,
+        options=_cdo_options(options, cdo_threads))
+    if tasks:
+        new_file_handlers = _fill_file_handlers(
+            new_file_handlers,
+            multiproc.map(single_fh_func, tasks, flatten=False))
+    logger.info('Finished sellonlatbox')
+    return new_file_handlers
+
+
+def _single_fh_sellonlatbox(task, lonlatbox, in_opt=None, options=''):
+    fh, in_file, out_file = task
+    cdo_result = get_cdo().sellonlatbox(
+        lonlatbox[0],
+        lonlatbox[2],
+        lonlatbox[3],
+        lonlatbox[1],
+        input=_cdo_input(in_file, in_opt),
+        **_cdo_output(out_file, options))
+    return _new_file_handler(fh, out_file, cdo_result)
 
 
 def griddes(*args, **kwargs):
-    if CDO is not None:
-        return CDO.griddes(*args, **kwargs)
+    cdo = get_cdo()
+    if cdo is not None:
+        return cdo.griddes(*args, **kwargs)
     else:
         logger.warning('To load the grid description with the cdos you '
                        'need to install the cdos!')
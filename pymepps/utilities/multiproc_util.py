@@ -124,7 +124,8 @@ def _multiprocess_map(self, single_func, iter_obj, flatten=True):
         data: list(obj)
             The bundled returned data for the mapping as list. If single_func
             has an iterable as return object, the iterable is converted to a
-            list.  If flatten is selected, the list will flattened
+            list.  If flatten is selected, the list will flattened. The order
+            of the data is the same as the order of the iterable object.
         """
         returned_data = []
         if self.threads:
@@ -134,12 +135,11 @@ def _multiprocess_map(self, single_func, iter_obj, flatten=True):
 
         ## From the multiprocessing _map_async code.
         chunksize, extra = divmod(len(iter_obj), self.processes * 4)
-        if extra:
+        if extra or not chunksize:
             chunksize += 1
 
         with tqdm(total=len(iter_obj)) as pbar:
-            for d_ind in p.imap_unordered(single_func, iter_obj,
-                                          chunksize=chunksize):
+            for d_ind in p.imap(single_func, iter_obj, chunksize=chunksize):
                 returned_data.append(d_ind)
                 pbar.update()
         p.close()
@@ -73,6 +73,37 @@ def test_repr_includes_lonlat(self):
                                           str(lonlat)),
             repr(self.frame.pp))
 
+    def test_update_merges_indexes(self):
+        first_frame = self.frame.iloc[:200]
+        second_frame = self.frame.iloc[100:]
+        updated_frame = first_frame.pp.update(second_frame)
+        pd.testing.assert_frame_equal(
+            updated_frame, self.frame.sort_index(axis=1), check_freq=False)
+
+    def test_update_sorts_disjoint_items(self):
+        updated_frame = self.frame.iloc[200:].pp.update(
+            self.frame.iloc[100:200], self.frame.iloc[:100])
+        pd.testing.assert_frame_equal(
+            updated_frame, self.frame.sort_index(axis=1), check_freq=False)
+
+    def test_update_prefers_newest_valid_values(self):
+        old_frame = self.frame.iloc[:10].copy()
+        mid_frame = old_frame.copy() + 1
+        new_frame = old_frame.copy() + 2
+        new_frame.iloc[:5, 0] = np.nan
+        updated_frame = old_frame.pp.update(mid_frame, new_frame)
+        right_frame = new_frame.copy()
+        right_frame.iloc[:5, 0] = mid_frame.iloc[:5, 0]
+        pd.testing.assert_frame_equal(
+            updated_frame, right_frame.sort_index(axis=1), check_freq=False)
+
+    def test_update_series_to_series(self):
+        self.series.name = 'test'
+        updated_series = self.series.iloc[:200].pp.update(
+            self.series.iloc[100:])
+        pd.testing.assert_series_equal(updated_series, self.series,
+                                       check_freq=False)
+
     def test_save_saves_creates_path(self):
         self.assertFalse(os.path.isfile('test.json'))
         self.series.pp.save('test.json')
@@ -24,17 +24,29 @@
 #
 # System modules
 import os
+import shutil
 import unittest
 import logging
 import datetime
+from unittest import mock
 
 # External modules
 import xarray as xr
 import numpy as np
 import pandas.util.testing as pdt
 
+try:
+    import zarr
+except ImportError:
+    zarr = None
+try:
+    import dask.array as da
+except ImportError:
+    da = None
+
 # Internal modules
 import pymepps.accessor
+import pymepps.accessor.spatial as spatial
 from pymepps.loader.datasets.spatialdataset import SpatialDataset
 from pymepps.loader.filehandler.netcdfhandler import NetCDFHandler
 from pymepps.grid import GridBuilder
@@ -54,19 +66,27 @@
 
 
 class TestSpatial(unittest.TestCase):
-    def setUp(self):
+    @classmethod
+    def setUpClass(cls):
         file = os.path.join(BASE_PATH, 'model', 'GFS_Global_0p25deg_20161219_0600.nc')
         ds = SpatialDataset(NetCDFHandler(file),)
-        self.array = xr.open_dataarray(file)
-        self.grid = ds.get_grid(
+        with xr.open_dataarray(file) as array:
+            cls._array = array.load()
+        cls._grid = ds.get_grid(
             'Maximum_temperature_height_above_ground_Mixed_intervals_Maximum',
-            data_array=self.array)
+            data_array=cls._array)
+
+    def setUp(self):
+        # Some tests modify the values, such that every test gets a copy
+        self.array = self._array.copy(deep=True)
+        self.grid = self._grid
 
     def tearDown(self):
         try:
             os.remove('test.nc')
         except FileNotFoundError:
             pass
+        shutil.rmtree('test.zarr', ignore_errors=True)
 
     def test_array_has_accessor(self):
         self.assertTrue(hasattr(self.array, 'pp'))
@@ -161,6 +181,25 @@ def test_update_updates_data(self):
         updated_array = self.array.pp.update(test_array)
         self.assertTrue(np.all(updated_array == 5))
 
+    @unittest.skipIf(da is None, 'dask is not installed')
+    def test_update_combines_dask_messages_lazily(self):
+        test_array = self.array.copy()
+        test_array['time'] = [datetime.datetime.utcnow(), ]
+        concatenated_array = xr.concat([self.array, test_array], dim='time')
+        lazy_array = self.array.chunk()
+        lazy_array.pp.grid = self.grid
+        updated_array = lazy_array.pp.update(test_array.chunk())
+        self.assertIsInstance(updated_array.data, da.Array)
+        np.testing.assert_equal(updated_array.values, concatenated_array.values)
+
+    def test_update_keeps_missing_coordinate_values(self):
+        test_array = self.array.expand_dims('runtime')
+        test_array['runtime'] = np.array([None, ], dtype=object)
+        test_array.pp.grid = self.grid
+        updated_array = test_array.pp.update(test_array.copy())
+        self.assertEqual(updated_array.shape, test_array.shape)
+        self.assertIsNone(updated_array['runtime'].values[0])
+
     def test_update_raises_error_if_concat_is_not_working(self):
         test_array = self.array.copy()
         test_array[:] = 5
@@ -300,6 +339,37 @@ def test_save_saves_same_data(self):
         opened_array = xr.open_dataarray('test.nc')
         xr.testing.assert_equal(opened_array, self.array)
 
+    def test_save_chunks_whole_time_axis(self):
+        self.array.pp.save('test.nc')
+        opened_array = xr.open_dataarray('test.nc')
+        time_axis = self.array.dims.index('time')
+        self.assertEqual(opened_array.encoding['chunksizes'][time_axis],
+                         len(self.array['time']))
+        self.assertTrue(opened_array.encoding['zlib'])
+
+    def test_save_uses_given_chunks(self):
+        chunks = (1, )*(self.array.ndim-2)+self.array.shape[-2:]
+        self.array.pp.save('test.nc', chunks=chunks)
+        opened_array = xr.open_dataarray('test.nc')
+        self.assertEqual(opened_array.encoding['chunksizes'], chunks)
+
+    def test_save_asynchronous_copies_data(self):
+        right_values = self.array.values.copy()
+        future = self.array.pp.save('test.nc', asynchronous=True)
+        self.array[:] = 0
+        future.result()
+        opened_array = xr.open_dataarray('test.nc')
+        np.testing.assert_equal(opened_array.values, right_values)
+
+    @unittest.skipIf(zarr is None, 'zarr is not installed')
+    def test_save_load_zarr_store(self):
+        self.array.pp.grid = self.grid
+        self.array.pp.save('test.zarr')
+        self.assertTrue(os.path.isdir('test.zarr'))
+        opened_array = xr.DataArray.pp.load('test.zarr')
+        np.testing.assert_equal(opened_array.values, self.array.values)
+        self.assertEqual(opened_array.pp.grid, self.grid)
+
     def test_save_saves_also_grid(self):
         self.array.pp.grid = self.grid
         self.array.pp.save('test.nc')
@@ -608,5 +678,111 @@ def test_selpoint_creates_and_set_new_grid(self):
         self.assertEqual(grid, returned_array.pp.grid)
 
 
+@unittest.skipIf(zarr is None, 'zarr is not installed')
+class TestZarrStore(unittest.TestCase):
+    def setUp(self):
+        grid_dict = {
+            'gridtype': 'lonlat',
+            'xname': 'lon',
+            'yname': 'lat',
+            'xsize': 4,
+            'ysize': 3,
+            'xfirst': 0,
+            'xinc': 1,
+            'yfirst': 50,
+            'yinc': 1,
+        }
+        self.grid = GridBuilder(grid_dict).build_grid()
+        self.array = xr.DataArray(
+            np.random.RandomState(42).normal(size=(2, 3, 4)),
+            coords=dict(time=[0, 1], lat=[50., 51., 52.],
+                        lon=[0., 1., 2., 3.]),
+            dims=('time', 'lat', 'lon'), name='test')
+        self.array.pp.grid = self.grid
+
+    def tearDown(self):
+        shutil.rmtree('test.zarr', ignore_errors=True)
+
+    def test_save_load_zarr_store_with_installed_zarr(self):
+        self.array.pp.save('test.zarr', complevel=3)
+        opened_array = xr.DataArray.pp.load('test.zarr')
+        np.testing.assert_equal(opened_array.values, self.array.values)
+        self.assertEqual(opened_array.pp.grid, self.grid)
+
+    def test_save_zarr_store_compresses_with_zstd(self):
+        self.array.pp.save('test.zarr', complevel=3)
+        zarr_array = zarr.open(os.path.join('test.zarr', 'test'), mode='r')
+        if hasattr(zarr_array, 'compressors'):
+            compressor = zarr_array.compressors[0]
+        else:
+            compressor = zarr_array.compressor
+        self.assertEqual(str(compressor.cname).split('.')[-1], 'zstd')
+        self.assertEqual(compressor.clevel, 3)
+
+
+
+@unittest.skipIf(spatial.scatter_messages is None, 'numba is not installed')
+class TestUpdateKernel(unittest.TestCase):
+    def setUp(self):
+        grid_dict = {
+            'gridtype': 'lonlat',
+            'xname': 'lon',
+            'yname': 'lat',
+            'xsize': 4,
+            'ysize': 3,
+            'xfirst': 0,
+            'xinc': 1,
+            'yfirst': 50,
+            'yinc': 1,
+        }
+        self.grid = GridBuilder(grid_dict).build_grid()
+        rnd = np.random.RandomState(42)
+        # 40 messages on 6 times and 4 ensemble members, such that there are
+        # overlapping and missing messages
+        self.positions = [(int(rnd.randint(6)), int(rnd.randint(4)))
+                          for _ in range(40)]
+        self.messages = []
+        for k, (time, ens) in enumerate(self.positions):
+            values = rnd.normal(size=(1, 1, 3, 8))
+            if k % 2:
+                # Non-contiguous message values
+                values = values[..., ::2]
+            else:
+                values = values[..., :4]
+            message = xr.DataArray(
+                values,
+                coords=dict(time=[time*3], ensemble=[ens],
+                            lat=[50., 51., 52.], lon=[0., 1., 2., 3.]),
+                dims=('time', 'ensemble', 'lat', 'lon'), name='test')
+            message.pp.grid = self.grid
+            self.messages.append(message)
+
+    def _update(self, kernel):
+        with mock.patch.object(spatial, 'use_kernel',
+                               return_value=kernel), \
+                mock.patch.object(spatial, 'scatter_messages',
+                                  wraps=spatial.scatter_messages) as scatter:
+            updated = self.messages[0].pp.update(*self.messages[1:])
+        self.assertEqual(scatter.called, kernel)
+        return updated
+
+    def test_update_kernel_equals_numpy_path(self):
+        kernel_array = self._update(True)
+        numpy_array = self._update(False)
+        xr.testing.assert_identical(kernel_array, numpy_array)
+
+    def test_update_kernel_writes_newest_messages(self):
+        kernel_array = self._update(True)
+        times = sorted(set(time*3 for time, _ in self.positions))
+        members = sorted(set(ens for _, ens in self.positions))
+        np.testing.assert_equal(kernel_array['time'].values, times)
+        np.testing.assert_equal(kernel_array['ensemble'].values, members)
+        expected = np.full((len(times), len(members), 3, 4), np.nan)
+        for (time, ens), message in zip(self.positions, self.messages):
+            expected[times.index(time*3), members.index(ens)] = \
+                message.values[0, 0]
+        self.assertTrue(np.isnan(expected).any())
+        np.testing.assert_equal(kernel_array.values, expected)
+
 if __name__ == '__main__':
     unittest.main()
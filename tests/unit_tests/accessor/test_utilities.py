@@ -43,6 +43,10 @@
 
 class TestPandasAccessor(unittest.TestCase):
     def setUp(self):
+        # The registered accessors are restored for the following tests
+        self.accessors = [(pd_cls, pd_cls.__dict__['pp'])
+                          for pd_cls in (pd.DataFrame, pd.Series)
+                          if 'pp' in pd_cls.__dict__]
         try:
             del pd.DataFrame.pp
         except AttributeError:
@@ -61,6 +65,8 @@ def tearDown(self):
             del pd.Series.pp
         except AttributeError:
             pass
+        for pd_cls, accessor in self.accessors:
+            setattr(pd_cls, 'pp', accessor)
 
     def test_series_accessor(self):
         @register_series_accessor('pp')
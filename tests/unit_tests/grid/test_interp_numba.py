@@ -0,0 +1,85 @@
+#!/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Created on 10.04.17
+
+Created for pymepps
+
+@author: Tobias Sebastian Finn, tobias.sebastian.finn@studium.uni-hamburg.de
+
+    Copyright (C) {2017}  {Tobias Sebastian Finn}
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+# System modules
+import unittest
+import logging
+import itertools
+
+# External modules
+import numpy as np
+
+# Internal modules
+from pymepps.grid.grid import Grid, _interpolation_dtype
+try:
+    from pymepps.grid._interp_numba import nearest_structured, \
+        bilinear_structured
+except ImportError:
+    nearest_structured = None
+    bilinear_structured = None
+
+
+logging.basicConfig(level=logging.DEBUG)
+
+
+@unittest.skipIf(nearest_structured is None, 'numba is not installed')
+class TestInterpNumba(unittest.TestCase):
+    def setUp(self):
+        rnd = np.random.RandomState(42)
+        self.data = rnd.normal(size=(3, 6, 7)) * 10
+        # Fractional indices with .5 fractions, integer and boundary indices
+        ind_lat = np.array([0., 0.5, 1.5, 2.5, 3.5, 4.5, 2.25, 5.])
+        ind_lon = np.array([0., 0.5, 1.5, 2.5, 3.5, 4.5, 5.5, 6., 3.75])
+        self.ind_lon, self.ind_lat = np.meshgrid(ind_lon, ind_lat)
+
+    def _kernel(self, kernel, data):
+        out = np.empty((data.shape[0], )+self.ind_lon.shape,
+                       dtype=_interpolation_dtype(data.dtype))
+        kernel(data, self.ind_lon, self.ind_lat, out)
+        return out
+
+    def test_kernels_equal_numpy_fallback(self):
+        kernels = ((0, nearest_structured), (1, bilinear_structured))
+        dtypes = (np.float64, np.float32, np.int32)
+        for (order, kernel), dtype in itertools.product(kernels, dtypes):
+            with self.subTest(order=order, dtype=dtype):
+                data = self.data.astype(dtype)
+                kernel_data = self._kernel(kernel, data)
+                numpy_data = Grid._interpolate_indices(
+                    data, self.ind_lat, self.ind_lon, order=order)
+                self.assertEqual(kernel_data.dtype, numpy_data.dtype)
+                np.testing.assert_allclose(kernel_data, numpy_data,
+                                           rtol=1E-5, atol=1E-5)
+
+    def test_nearest_rounds_half_to_even(self):
+        kernel_data = self._kernel(nearest_structured, self.data)
+        lat_ind = np.around(self.ind_lat).astype(int)
+        lon_ind = np.around(self.ind_lon).astype(int)
+        np.testing.assert_equal(kernel_data,
+                                self.data[:, lat_ind, lon_ind])
+        np.testing.assert_equal(lat_ind[1:6, 0], [0, 2, 2, 4, 4])
+
+
+if __name__ == '__main__':
+    unittest.main()
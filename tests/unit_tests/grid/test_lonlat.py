@@ -31,11 +31,19 @@
 import numpy as np
 import xarray as xr
 
-from mpl_toolkits.basemap import interp
+try:
+    from mpl_toolkits.basemap import interp
+except ImportError:
+    interp = None
+try:
+    import dask.array as da
+except ImportError:
+    da = None
 
 # Internal modules
 from pymepps.grid import GridBuilder
 from pymepps.grid.lonlat import LonLatGrid
+from pymepps.grid.grid import distance_haversine
 
 
 logging.basicConfig(level=logging.DEBUG)
@@ -132,6 +140,16 @@ def test_convert_to_degree_radian_to_deg(self):
         returned_lon = self.grid.convert_to_deg(field=lon, unit='radian')
         np.testing.assert_array_equal(lon*180/np.pi, returned_lon)
 
+    def test_convert_to_degree_returns_degree_field(self):
+        lon = self.const_lat_lon(
+            self.grid_dict['xfirst'],
+            self.grid_dict['xsize'],
+            self.grid_dict['xinc']
+        )
+        returned_lon = self.grid.convert_to_deg(field=lon,
+                                                unit='degrees_east')
+        self.assertIs(lon, returned_lon)
+
     def test_convert_to_degree_raises_error_if_unknown_unit(self):
         lon = self.const_lat_lon(
             self.grid_dict['xfirst'],
@@ -170,6 +188,16 @@ def test_get_coords_returns_xr_conform_coords(self):
             self.grid_dict['yname'], returned_coords
         )
 
+    def test_get_coords_reuses_index_variables(self):
+        returned_coords = self.grid.get_coords()
+        returned_coords.pop(self.grid_dict['xname'])
+        second_coords = self.grid.get_coords()
+        self.assertIn(self.grid_dict['xname'], second_coords)
+        self.assertIsInstance(second_coords[self.grid_dict['yname']],
+                              xr.IndexVariable)
+        self.assertIs(returned_coords[self.grid_dict['yname']],
+                      second_coords[self.grid_dict['yname']])
+
     def test_normalize_grid_sorts_data(self):
         lat = np.arange(90, -90, -30)
         lon = np.arange(-180, 180, 30)
@@ -187,6 +215,28 @@ def test_normalize_grid_sorts_data(self):
         np.testing.assert_array_equal(lon, normalized_output[1])
         np.testing.assert_array_equal(data, normalized_output[2])
 
+    def test_normalize_grid_returns_view_of_monotonic_data(self):
+        lat = np.arange(90, -90, -30)
+        lon = np.arange(-180, 180, 30)
+        lat, lon = np.meshgrid(lat, lon)
+        lat = lat.transpose()
+        lon = lon.transpose()
+        data = np.random.normal(size=(3, )+lat.shape)
+        normalized_output = self.grid.normalize_lat_lon(lat, lon, data)
+        np.testing.assert_array_equal(data[..., ::-1, :],
+                                      normalized_output[2])
+        self.assertTrue(np.shares_memory(data, normalized_output[2]))
+
+    def test_normalize_grid_keeps_order_of_curvilinear_coords(self):
+        y, x = np.meshgrid(np.arange(5), np.arange(6), indexing='ij')
+        lat = 50 + 0.5 * (y - 2) ** 2 - 0.3 * x
+        lon = 10 + np.abs(x - 2) + 0.3 * y
+        data = np.random.normal(size=(2, )+lat.shape)
+        normalized_output = self.grid.normalize_lat_lon(lat, lon, data)
+        np.testing.assert_array_equal(lat, normalized_output[0])
+        np.testing.assert_array_equal(lon, normalized_output[1])
+        self.assertIs(data, normalized_output[2])
+
     def test_normalize_grid_normalize_lon(self):
         lat = np.arange(90, -90, -30)
         lon = np.arange(0, 360, 30)
@@ -201,6 +251,21 @@ def test_normalize_grid_normalize_lon(self):
         lon = lon[sort_order_lat, sort_order_lon]
         np.testing.assert_array_equal(lon, normalized_output[1])
 
+    def test_normalize_grid_normalize_lon_multiple_rotations(self):
+        lat = np.arange(90, -90, -30)
+        lon = np.arange(0, 1080, 90)
+        lat, lon = np.meshgrid(lat, lon)
+        lat = lat.transpose()
+        lon = lon.transpose()
+        normalized_output = self.grid.normalize_lat_lon(lat, lon)
+        while np.any(lon > 180):
+            lon[lon > 180] -= 360
+        np.testing.assert_array_equal(np.sort(lon, axis=1),
+                                      np.sort(normalized_output[1], axis=1))
+        self.assertTrue(np.all(normalized_output[1] <= 180))
+        self.assertTrue(np.all(normalized_output[1] > -180))
+
+    @unittest.skipIf(interp is None, 'basemap is not installed')
     def test_interpolate_with_nearest_neighbour(self):
         ll_lat, ll_lon = self.grid._calc_lat_lon()
         data = np.arange(ll_lat.size).reshape(ll_lat.shape)
@@ -216,6 +281,7 @@ def test_interpolate_with_nearest_neighbour(self):
                                      g_lat, g_lon, order=0)
         np.testing.assert_array_equal(remapped_values, interpolated_values)
 
+    @unittest.skipIf(interp is None, 'basemap is not installed')
     def test_interpolate_with_bilinear(self):
         ll_lat, ll_lon = self.grid._calc_lat_lon()
         data = np.arange(ll_lat.size).reshape(ll_lat.shape)
@@ -230,6 +296,70 @@ def test_interpolate_with_bilinear(self):
                                      g_lat, g_lon, order=1)
         np.testing.assert_array_equal(remapped_values, interpolated_values)
 
+    def test_interpolate_keeps_float32(self):
+        ll_lat, ll_lon = self.grid._calc_lat_lon()
+        data = np.random.normal(size=ll_lat.shape).astype(np.float32)
+        file = os.path.join(BASE_PATH, 'grids', 'gaussian_y')
+        builder = GridBuilder(file)
+        gaussian_grid = builder.build_grid()
+        for order in (0, 1):
+            remapped_values = self.grid.interpolate(data, gaussian_grid, order)
+            self.assertEqual(remapped_values.dtype, np.float32)
+            interpolated_values = self.grid.interpolate(
+                data.astype(np.float64), gaussian_grid, order)
+            np.testing.assert_allclose(remapped_values, interpolated_values,
+                                       rtol=1E-5, atol=1E-6)
+
+    def test_interpolate_to_unstructured_uses_structured_path(self):
+        ll_lat, ll_lon = self.grid._calc_lat_lon()
+        data = np.random.normal(size=[2, ]+list(ll_lat.shape))
+        file = os.path.join(BASE_PATH, 'grids', 'gaussian_y')
+        gaussian_grid = GridBuilder(file).build_grid()
+        g_lat, g_lon = gaussian_grid._calc_lat_lon()
+        g_lat, g_lon, _ = self.grid.normalize_lat_lon(g_lat, g_lon)
+        unstructured_grid = GridBuilder(dict(
+            gridtype='unstructured', gridsize=g_lat.size,
+            xvals=list(g_lon.ravel()), yvals=list(g_lat.ravel()),
+            xunits='degrees', yunits='degrees'
+        )).build_grid()
+        for order in (0, 1):
+            remapped_values = self.grid.interpolate(
+                data, unstructured_grid, order)
+            structured_values = self.grid.interpolate(
+                data, gaussian_grid, order)
+            np.testing.assert_allclose(
+                remapped_values, structured_values.reshape((2, -1)))
+        small_grid = GridBuilder(dict(
+            gridtype='lonlat', xsize=4, ysize=3, xfirst=0, xinc=1,
+            yfirst=50, yinc=1)).build_grid()
+        small_data = np.arange(24.).reshape(2, 3, 4)
+        target_grid = GridBuilder(dict(
+            gridtype='unstructured', gridsize=3, xvals=[1.5, 10., 3.],
+            yvals=[51., 60., 52.], xunits='degrees', yunits='degrees'
+        )).build_grid()
+        remapped_values = small_grid.interpolate(small_data, target_grid, 1)
+        np.testing.assert_allclose(
+            remapped_values, [[5.5, np.nan, 11.], [17.5, np.nan, 23.]])
+        remapped_values = small_grid.interpolate(small_data, target_grid, 0)
+        self.assertFalse(np.isnan(remapped_values).any())
+
+    @unittest.skipIf(da is None, 'dask is not installed')
+    def test_interpolate_dask_array_is_lazy(self):
+        ll_lat, ll_lon = self.grid._calc_lat_lon()
+        data = xr.DataArray(
+            np.random.normal(size=[5, ]+list(ll_lat.shape)),
+            dims=['time', ]+list(self.grid.get_coord_names()),
+            coords=dict(time=np.arange(5))
+        )
+        file = os.path.join(BASE_PATH, 'grids', 'gaussian_y')
+        gaussian_grid = GridBuilder(file).build_grid()
+        remapped_values = self.grid.interpolate(data, gaussian_grid, 1)
+        lazy_values = self.grid.interpolate(data.chunk({'time': 1}),
+                                            gaussian_grid, 1)
+        self.assertIsInstance(lazy_values.data, da.Array)
+        np.testing.assert_array_almost_equal(remapped_values.values,
+                                             lazy_values.values)
+
     def test_get_nearest_point(self):
         ll_lat, ll_lon = self.grid._calc_lat_lon()
         data = np.random.normal(size=ll_lat.shape)
@@ -250,6 +380,27 @@ def test_get_nearest_point_multi_dim(self):
         extracted_data = self.grid.get_nearest_point(data, target_point)
         np.testing.assert_array_equal(target_data, extracted_data)
 
+    def test_distance_returns_haversine_distance(self):
+        ll_lat, ll_lon = self.grid._calc_lat_lon()
+        coord = (53.5, 10)
+        returned_distance = self.grid.distance(coord)
+        self.assertEqual(returned_distance.shape, ll_lat.shape)
+        np.testing.assert_allclose(
+            returned_distance, distance_haversine(coord, (ll_lat, ll_lon)))
+
+    def test_nearest_point_falls_back_to_distance(self):
+        ll_lat, ll_lon = self.grid._calc_lat_lon()
+        coord = (53.45, 10.05)
+        nan_lat = np.array(ll_lat, dtype=float)
+        nan_lat[0, 0] = np.nan
+        self.grid._raw_lat_lon = (nan_lat, ll_lon)
+        returned_ind = self.grid.nearest_point(coord)
+        self.assertIs(self.grid._kdtree, False)
+        nearest_ind = np.unravel_index(
+            np.argmin(distance_haversine(coord, (ll_lat, ll_lon))),
+            ll_lat.shape)
+        self.assertTupleEqual(tuple(returned_ind), tuple(nearest_ind))
+
     def test_lonlatbox_returns_array(self):
         ll_lat, ll_lon = self.grid._calc_lat_lon()
         data = np.random.normal(size=[5,]+list(ll_lat.shape))
@@ -315,6 +466,20 @@ def test_lonlatbox_returns_new_grid_with_right_values(self):
         self.assertNotIn('xfirst', new_grid._grid_dict)
         self.assertNotIn('yfirst', new_grid._grid_dict)
 
+    def test_lonlatbox_returns_view_of_data(self):
+        calc_lat, calc_lon = self.grid._construct_dim()
+        ll_lat, ll_lon = self.grid._calc_lat_lon()
+        data = np.random.normal(size=[5,]+list(ll_lat.shape))
+        target_box = (0, 10, 10, 0)
+        extracted_data, _ = self.grid.lonlatbox(data, target_box)
+        lat_bound = np.logical_and(calc_lat >= target_box[3],
+                                   calc_lat <= target_box[1])
+        lon_bound = np.logical_and(calc_lon >= target_box[0],
+                                   calc_lon <= target_box[2])
+        target_data = data[..., lat_bound, :][..., lon_bound]
+        np.testing.assert_array_equal(extracted_data, target_data)
+        self.assertTrue(np.shares_memory(extracted_data, data))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -30,6 +30,7 @@
 # External modules
 import numpy as np
 import xarray as xr
+from scipy.interpolate import griddata
 
 # Internal modules
 from pymepps.grid import GridBuilder
@@ -69,5 +70,65 @@ def test__calc_lat_lon_gets_lat_lon(self):
             self.grid._grid_dict['xvals']
         )
 
+    def _interpolate_with_griddata(self, data, other_grid, method):
+        src_lat, src_lon = self.grid._calc_lat_lon()
+        trg_lat, trg_lon = other_grid._calc_lat_lon()
+        src_coords = np.stack((src_lat, src_lon), axis=-1)
+        trg_coords = np.stack((trg_lat.ravel(), trg_lon.ravel()), axis=-1)
+        interpolated_values = [
+            griddata(src_coords, sliced_data, trg_coords, method=method)
+            for sliced_data in data.reshape((-1, src_lat.size))]
+        return np.array(interpolated_values).reshape(
+            data.shape[:-1]+trg_lat.shape)
+
+    def test_interpolate_with_nearest_neighbour(self):
+        trg_grid = GridBuilder(dict(
+            gridtype='lonlat', xsize=10, ysize=5, xfirst=-90, xinc=20,
+            yfirst=-40, yinc=20, xunits='degrees', yunits='degrees'
+        )).build_grid()
+        data = np.random.normal(size=(3, 2, int(self.grid_dict['gridsize'])))
+        remapped_values = self.grid.interpolate(data, trg_grid, 0)
+        interpolated_values = self._interpolate_with_griddata(
+            data, trg_grid, 'nearest')
+        np.testing.assert_array_equal(remapped_values, interpolated_values)
+
+    def test_interpolate_with_linear(self):
+        trg_grid = GridBuilder(dict(
+            gridtype='lonlat', xsize=10, ysize=5, xfirst=-90, xinc=20,
+            yfirst=-40, yinc=20, xunits='degrees', yunits='degrees'
+        )).build_grid()
+        data = np.random.normal(size=(3, 2, int(self.grid_dict['gridsize'])))
+        remapped_values = self.grid.interpolate(data, trg_grid, 1)
+        interpolated_values = self._interpolate_with_griddata(
+            data, trg_grid, 'linear')
+        np.testing.assert_allclose(remapped_values, interpolated_values)
+
+    def test_interpolate_to_same_grid_returns_data(self):
+        data = np.random.normal(size=(3, 2, int(self.grid_dict['gridsize'])))
+        remapped_values = self.grid.interpolate(data, self.grid, 0)
+        np.testing.assert_array_equal(remapped_values, data)
+
+    def test_interpolate_keeps_float32(self):
+        data = np.random.normal(
+            size=(3, 2, int(self.grid_dict['gridsize']))).astype(np.float32)
+        for order in (0, 1):
+            remapped_values = self.grid.interpolate(data, self.grid, order)
+            self.assertEqual(remapped_values.dtype, np.float32)
+
+    def test_lonlatbox_slices_points_within_box(self):
+        calc_lat, calc_lon = self.grid._calc_lat_lon()
+        data = np.random.normal(size=(3, int(self.grid_dict['gridsize'])))
+        target_box = (-40, 60, 40, 0)
+        extracted_data, new_grid = self.grid.lonlatbox(data, target_box)
+        bound = np.logical_and(
+            np.logical_and(calc_lat >= 0, calc_lat <= 60),
+            np.logical_and(calc_lon >= -40, calc_lon <= 40))
+        np.testing.assert_array_equal(extracted_data, data[..., bound])
+        np.testing.assert_array_equal(new_grid._grid_dict['yvals'],
+                                      calc_lat[bound])
+        np.testing.assert_array_equal(new_grid._grid_dict['xvals'],
+                                      calc_lon[bound])
+
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
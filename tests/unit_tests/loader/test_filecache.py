@@ -0,0 +1,130 @@
+#!/bin/env python
+# -*- coding: utf-8 -*-
+#
+#Created on 14.10.26
+#
+#Created for pymepps
+#
+#@author: Tobias Sebastian Finn, tobias.sebastian.finn@studium.uni-hamburg.de
+#
+#    Copyright (C) {2026}  {Tobias Sebastian Finn}
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# System modules
+import os
+import gc
+import unittest
+import logging
+import weakref
+import pickle
+
+# External modules
+
+# Internal modules
+from pymepps.loader.datasets.filecache import OpenFileCache, open_file_cache, \
+    set_max_open_files, DEFAULT_MAX_SIZE
+from pymepps.loader.datasets.tsdataset import TSDataset
+from pymepps.loader.filehandler.netcdfhandler import NetCDFHandler
+
+
+BASE_PATH = os.path.join(
+    os.path.dirname(
+        os.path.dirname(
+            os.path.dirname(
+                os.path.dirname(
+                    os.path.realpath(__file__))))),
+    'data')
+
+logging.basicConfig(level=logging.DEBUG)
+
+
+class TestOpenFileCache(unittest.TestCase):
+    def setUp(self):
+        self.file = os.path.join(BASE_PATH, 'station', 'wettermast.nc')
+        self.cache = OpenFileCache(max_size=2)
+
+    def tearDown(self):
+        self.cache.close_all()
+
+    def test_acquire_keeps_handler_open(self):
+        handler = NetCDFHandler(self.file)
+        with self.cache.acquire(handler) as opened_handler:
+            self.assertIs(opened_handler, handler)
+        self.assertIsNotNone(handler.ds)
+        self.assertEqual(len(self.cache), 1)
+
+    def test_cache_does_not_keep_handler_alive(self):
+        handler = NetCDFHandler(self.file)
+        with self.cache.acquire(handler):
+            pass
+        handler_ref = weakref.ref(handler)
+        del handler
+        gc.collect()
+        self.assertIsNone(handler_ref())
+        self.assertEqual(len(self.cache), 0)
+
+    def test_max_size_closes_least_recently_used(self):
+        handlers = [NetCDFHandler(self.file) for _ in range(3)]
+        for handler in handlers:
+            with self.cache.acquire(handler):
+                pass
+        self.assertIsNone(handlers[0].ds)
+        self.assertIsNotNone(handlers[2].ds)
+        self.cache.max_size = 1
+        self.assertIsNone(handlers[1].ds)
+        self.assertEqual(len(self.cache), 1)
+
+    def test_close_closes_given_handlers(self):
+        handlers = [NetCDFHandler(self.file) for _ in range(2)]
+        for handler in handlers:
+            with self.cache.acquire(handler):
+                pass
+        self.cache.close(handlers[:1])
+        self.assertIsNone(handlers[0].ds)
+        self.assertIsNotNone(handlers[1].ds)
+        self.assertEqual(len(self.cache), 1)
+
+    def test_cache_does_not_keep_loaded_values(self):
+        for chunks in (None, False):
+            fresh_handler = NetCDFHandler(self.file, chunks=chunks).open()
+            fresh_size = len(pickle.dumps(fresh_handler.ds))
+            fresh_handler.close()
+            handler = NetCDFHandler(self.file, chunks=chunks)
+            with self.cache.acquire(handler):
+                var_name = handler.var_names[0]
+                handler.get_timeseries(var_name)
+                handler.get_messages(var_name)
+            self.assertIsNotNone(handler.ds)
+            self.assertEqual(len(pickle.dumps(handler.ds)), fresh_size)
+
+    def test_set_max_open_files_sets_and_restores_limit(self):
+        default_size = open_file_cache.max_size
+        set_max_open_files(1)
+        self.assertEqual(open_file_cache.max_size, 1)
+        set_max_open_files()
+        self.assertEqual(open_file_cache.max_size, default_size)
+        self.assertLessEqual(default_size, DEFAULT_MAX_SIZE)
+
+    def test_dataset_context_closes_its_files(self):
+        with TSDataset(NetCDFHandler(self.file)) as dataset:
+            dataset.select(dataset.var_names[0])
+            self.assertIsNotNone(dataset.file_handlers[0].ds)
+        self.assertIsNone(dataset.file_handlers[0].ds)
+        self.assertNotIn(id(dataset.file_handlers[0]),
+                         open_file_cache._handlers)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,143 @@
+#!/bin/env python
+# -*- coding: utf-8 -*-
+#
+#Created on 14.10.26
+#
+#Created for pymepps
+#
+#@author: Tobias Sebastian Finn, tobias.sebastian.finn@studium.uni-hamburg.de
+#
+#    Copyright (C) {2026}  {Tobias Sebastian Finn}
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# System modules
+import os
+import unittest
+import logging
+from unittest import mock
+
+# External modules
+import xarray as xr
+
+try:
+    import hidefix
+except ImportError:
+    hidefix = None
+try:
+    import dask
+except ImportError:
+    dask = None
+
+# Internal modules
+from pymepps.loader.filehandler.hidefixhandler import HidefixHandler
+from pymepps.loader.model import ModelLoader
+
+
+BASE_PATH = os.path.join(
+    os.path.dirname(
+        os.path.dirname(
+            os.path.dirname(
+                os.path.dirname(
+                    os.path.realpath(__file__))))),
+    'data')
+
+logging.basicConfig(level=logging.DEBUG)
+
+
+class TestHidefixHandler(unittest.TestCase):
+    def setUp(self):
+        self.file = os.path.join(BASE_PATH, 'station', 'wettermast.nc')
+        self.handler = HidefixHandler(self.file)
+
+    def tearDown(self):
+        self.handler.close()
+
+    def _open_as_hidefix(self):
+        """
+        Open the file with the netcdf4 engine, while the handler still uses
+        the hidefix engine.
+        """
+        open_dataset = self.handler._open_dataset
+        return mock.patch.object(
+            self.handler, '_open_dataset',
+            side_effect=lambda engine: open_dataset('netcdf4'))
+
+    @unittest.skipIf(hidefix is not None, 'hidefix is installed')
+    def test_open_falls_back_to_netcdf4(self):
+        self.assertEqual(self.handler.engine, 'hidefix')
+        self.handler.open()
+        self.assertEqual(self.handler.engine, 'netcdf4')
+        self.assertIsInstance(self.handler.ds, xr.Dataset)
+        var_name = self.handler.var_names[0]
+        self.assertIsInstance(self.handler.get_messages(var_name),
+                              xr.DataArray)
+
+    @unittest.skipIf(dask is None, 'dask is not installed')
+    def test_get_messages_loads_only_with_hidefix(self):
+        self.handler = HidefixHandler(self.file, chunks={'time': 100})
+        with self._open_as_hidefix():
+            self.handler.open()
+        var_name = 'TT002_M10'
+        self.assertIsNone(self.handler.get_messages(var_name).chunks)
+        self.handler._engine = 'netcdf4'
+        self.assertIsNotNone(self.handler.get_messages(var_name).chunks)
+        self.assertIsNotNone(self.handler.ds[var_name].chunks)
+
+    def test_decoding_error_falls_back_to_netcdf4(self):
+        with self._open_as_hidefix():
+            self.handler.open()
+        engines = []
+
+        def read_func(var_name):
+            engines.append(self.handler.engine)
+            if self.handler.engine == 'hidefix':
+                raise ValueError('unsupported filter')
+            return var_name
+
+        returned = self.handler._read_with_fallback(read_func, 'test')
+        self.assertEqual(returned, 'test')
+        self.assertListEqual(engines, ['hidefix', 'netcdf4'])
+        self.assertIsNotNone(self.handler.ds)
+
+    def test_decoding_error_with_netcdf4_is_raised(self):
+        self.handler._engine = 'netcdf4'
+        read_func = mock.Mock(side_effect=OSError('broken file'))
+        with self.assertRaises(OSError):
+            self.handler._read_with_fallback(read_func, 'test')
+        self.assertEqual(read_func.call_count, 1)
+
+
+class TestHidefixModelLoader(unittest.TestCase):
+    def test_loader_sets_rayon_threads(self):
+        with mock.patch.dict(os.environ):
+            os.environ.pop('RAYON_NUM_THREADS', None)
+            ModelLoader('test.nc', file_type='hidefix', processes=4)
+            self.assertEqual(os.environ['RAYON_NUM_THREADS'], '4')
+
+    def test_loader_keeps_set_rayon_threads(self):
+        with mock.patch.dict(os.environ, {'RAYON_NUM_THREADS': '2'}):
+            ModelLoader('test.nc', file_type='hidefix', processes=4)
+            self.assertEqual(os.environ['RAYON_NUM_THREADS'], '2')
+
+    def test_loader_sets_no_threads_for_other_types(self):
+        with mock.patch.dict(os.environ):
+            os.environ.pop('RAYON_NUM_THREADS', None)
+            ModelLoader('test.nc', file_type='nc', processes=4)
+            ModelLoader('test.nc', file_type='hidefix', processes=1)
+            self.assertNotIn('RAYON_NUM_THREADS', os.environ)
+
+
+if __name__ == '__main__':
+    unittest.main()
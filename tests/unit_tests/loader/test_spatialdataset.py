@@ -0,0 +1,124 @@
+#!/bin/env python
+# -*- coding: utf-8 -*-
+#
+#Created on 14.10.26
+#
+#Created for pymepps
+#
+#@author: Tobias Sebastian Finn, tobias.sebastian.finn@studium.uni-hamburg.de
+#
+#    Copyright (C) {2026}  {Tobias Sebastian Finn}
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# System modules
+import os
+import shutil
+import tempfile
+import unittest
+import logging
+
+# External modules
+import xarray as xr
+import numpy as np
+import pandas as pd
+
+try:
+    import dask
+except ImportError:
+    dask = None
+
+# Internal modules
+from pymepps.grid import GridBuilder
+from pymepps.loader.datasets.spatialdataset import SpatialDataset
+from pymepps.loader.filehandler.netcdfhandler import NetCDFHandler
+
+
+logging.basicConfig(level=logging.DEBUG)
+
+
+class TestSpatialDataset(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        grid_dict = {
+            'gridtype': 'lonlat',
+            'xname': 'lon',
+            'yname': 'lat',
+            'xsize': 4,
+            'ysize': 3,
+            'xfirst': 0,
+            'xinc': 1,
+            'yfirst': 50,
+            'yinc': 1,
+        }
+        self.grid = GridBuilder(grid_dict).build_grid()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def _create_dataset(self, starts):
+        file_handlers = []
+        for k, start in enumerate(starts):
+            time = pd.date_range('2016-12-19 06:00', periods=4, freq='H')
+            time = time + pd.Timedelta(hours=start)
+            values = np.random.RandomState(k).normal(size=(4, 3, 4))
+            ds = xr.Dataset(
+                {'t2m': (('time', 'lat', 'lon'), values+10*k)},
+                coords=dict(time=time, lat=[50., 51., 52.],
+                            lon=[0., 1., 2., 3.]))
+            path = os.path.join(self.tmp_dir, 'file{0:d}.nc'.format(k))
+            ds.to_netcdf(path)
+            file_handlers.append(NetCDFHandler(path))
+        return SpatialDataset(file_handlers, grid=self.grid)
+
+    def test_select_prefers_newest_file_for_overlaps(self):
+        dataset = self._create_dataset([0, 2])
+        selected = dataset.select('t2m')
+        self.assertEqual(selected['validtime'].size, 6)
+        with xr.open_dataset(dataset.file_handlers[1].file) as newest_ds:
+            np.testing.assert_equal(
+                selected.isel(validtime=slice(2, None)).values.squeeze(),
+                newest_ds['t2m'].values)
+
+    @unittest.skipIf(dask is None, 'dask is not installed')
+    def test_lazy_select_equals_select_for_overlapping_files(self):
+        dataset = self._create_dataset([0, 2])
+        lazy_selected = dataset.select('t2m', lazy=True)
+        selected = dataset.select('t2m')
+        xr.testing.assert_identical(lazy_selected.load(), selected.load())
+
+    @unittest.skipIf(dask is None, 'dask is not installed')
+    def test_lazy_select_equals_select_for_identical_coords(self):
+        dataset = self._create_dataset([0, 0])
+        lazy_selected = dataset.select('t2m', lazy=True)
+        selected = dataset.select('t2m')
+        xr.testing.assert_identical(lazy_selected.load(), selected.load())
+
+    @unittest.skipIf(dask is None, 'dask is not installed')
+    def test_lazy_select_combines_disjoint_files_lazily(self):
+        dataset = self._create_dataset([0, 4])
+        lazy_selected = dataset.select('t2m', lazy=True)
+        self.assertIsNotNone(lazy_selected.chunks)
+        selected = dataset.select('t2m')
+        xr.testing.assert_identical(lazy_selected.load(), selected.load())
+
+    @unittest.skipIf(dask is None, 'dask is not installed')
+    def test_to_xarray_raises_value_error_for_overlapping_files(self):
+        dataset = self._create_dataset([0, 0])
+        with self.assertRaises(ValueError):
+            dataset.to_xarray('t2m')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+#!/bin/env python
+# -*- coding: utf-8 -*-
+#
+#Created on 14.10.26
+#
+#Created for pymepps
+#
+#@author: Tobias Sebastian Finn, tobias.sebastian.finn@studium.uni-hamburg.de
+#
+#    Copyright (C) {2026}  {Tobias Sebastian Finn}
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# System modules
+import os
+import unittest
+import logging
+
+# External modules
+import xarray as xr
+
+# Internal modules
+from pymepps.loader.datasets.tsdataset import TSDataset
+from pymepps.loader.filehandler.filehandler import FileHandler
+from pymepps.loader.filehandler.netcdfhandler import NetCDFHandler
+from pymepps.loader.filehandler.memoryhandler import InMemoryHandler
+from pymepps.loader.filehandler.wmtexthandler import WMTextHandler
+
+
+BASE_PATH = os.path.join(
+    os.path.dirname(
+        os.path.dirname(
+            os.path.dirname(
+                os.path.dirname(
+                    os.path.realpath(__file__))))),
+    'data')
+
+logging.basicConfig(level=logging.DEBUG)
+
+
+class TestTSDataset(unittest.TestCase):
+    def setUp(self):
+        self.file = os.path.join(BASE_PATH, 'station', 'wettermast.nc')
+
+    def test_lon_lat_from_netcdf_handler(self):
+        ds = TSDataset(NetCDFHandler(self.file))
+        lon_lat = ds._get_lon_lat()
+        self.assertAlmostEqual(lon_lat['latitude'], 53.5199, places=4)
+        self.assertAlmostEqual(lon_lat['longitude'], 10.1051, places=4)
+        self.assertIn('altitude', lon_lat)
+
+    def test_lon_lat_from_in_memory_handler(self):
+        with xr.open_dataset(self.file) as opened_ds:
+            handler = InMemoryHandler(opened_ds.load())
+        ds = TSDataset(handler)
+        self.assertEqual(ds._get_lon_lat(), NetCDFHandler(self.file).lon_lat)
+
+    def test_lon_lat_from_handler_without_position(self):
+        ds = TSDataset(None)
+        ds.file_handlers = WMTextHandler('wettermast.txt')
+        self.assertEqual(ds._get_lon_lat(), {})
+
+    def test_lon_lat_is_property_of_all_handlers(self):
+        for handler in (FileHandler, NetCDFHandler, InMemoryHandler,
+                        WMTextHandler):
+            self.assertIsInstance(handler.lon_lat, property)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,154 @@
+#!/bin/env python
+# -*- coding: utf-8 -*-
+#
+#Created on 14.10.26
+#
+#Created for pymepps
+#
+#@author: Tobias Sebastian Finn, tobias.sebastian.finn@studium.uni-hamburg.de
+#
+#    Copyright (C) {2026}  {Tobias Sebastian Finn}
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# System modules
+import os
+import unittest
+import logging
+import tempfile
+import shutil
+import json
+from unittest import mock
+
+# External modules
+
+# Internal modules
+from pymepps.loader.filehandler import varname_cache
+from pymepps.loader.filehandler.filehandler import FileHandler
+from pymepps.loader.datasets.tsdataset import TSDataset
+
+
+logging.basicConfig(level=logging.DEBUG)
+
+
+class CountingHandler(FileHandler):
+    def __init__(self, file_path, var_names):
+        super().__init__(file_path)
+        self._disk_var_names = var_names
+        self.scans = 0
+
+    def _get_varnames(self):
+        self.scans += 1
+        return self._disk_var_names
+
+    def get_messages(self, var_name, **kwargs):
+        pass
+
+    def get_timeseries(self, var_name, **kwargs):
+        pass
+
+    def open(self):
+        return self
+
+    def close(self):
+        pass
+
+    def is_type(self):
+        return True
+
+
+class TestVarnameCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.file = os.path.join(self.tmp_dir, 'file.nc')
+        with open(self.file, 'w') as fp:
+            fp.write('data')
+        self.index_path = os.path.join(self.tmp_dir, varname_cache.INDEX_NAME)
+        self.var_names = ['T', 'RH', 'P']
+
+    def tearDown(self):
+        varname_cache.flush()
+        varname_cache._INDEXES.pop(self.index_path, None)
+        shutil.rmtree(self.tmp_dir)
+
+    def _clear_memory(self):
+        varname_cache._INDEXES.pop(self.index_path, None)
+
+    def test_hit_returns_stored_names_unsorted(self):
+        handler = CountingHandler(self.file, self.var_names)
+        self.assertListEqual(handler.var_names, self.var_names)
+        varname_cache.flush()
+        self._clear_memory()
+        new_handler = CountingHandler(self.file, self.var_names)
+        self.assertListEqual(new_handler.var_names, self.var_names)
+        self.assertEqual(new_handler.scans, 0)
+
+    def test_put_writes_only_at_flush(self):
+        varname_cache.put(self.file, 'CountingHandler', self.var_names)
+        self.assertFalse(os.path.isfile(self.index_path))
+        varname_cache.flush()
+        with open(self.index_path, mode='r') as fp:
+            index = json.load(fp)
+        self.assertListEqual(index['CountingHandler:file.nc']['var_names'],
+                             self.var_names)
+
+    def test_dataset_flushes_index_once(self):
+        second_file = os.path.join(self.tmp_dir, 'second.nc')
+        with open(second_file, 'w') as fp:
+            fp.write('data')
+        handlers = [CountingHandler(self.file, self.var_names),
+                    CountingHandler(second_file, ['T'])]
+        with mock.patch.object(varname_cache, '_write_index',
+                               wraps=varname_cache._write_index) as write:
+            TSDataset(handlers)
+        self.assertEqual(write.call_count, 1)
+        with open(self.index_path, mode='r') as fp:
+            index = json.load(fp)
+        self.assertSetEqual(
+            set(index.keys()),
+            {'CountingHandler:file.nc', 'CountingHandler:second.nc'})
+
+    def test_stale_stamp_after_touching_file(self):
+        varname_cache.put(self.file, 'CountingHandler', self.var_names)
+        varname_cache.flush()
+        file_stat = os.stat(self.file)
+        os.utime(self.file, ns=(file_stat.st_atime_ns,
+                                file_stat.st_mtime_ns + 10**9))
+        self.assertIsNone(varname_cache.get(self.file, 'CountingHandler'))
+        handler = CountingHandler(self.file, self.var_names)
+        self.assertListEqual(handler.var_names, self.var_names)
+        self.assertEqual(handler.scans, 1)
+
+    def test_disabled_cache(self):
+        with mock.patch.dict(os.environ, {'PYMEPPS_VARNAME_CACHE': '0'}):
+            varname_cache.put(self.file, 'CountingHandler', self.var_names)
+            varname_cache.flush()
+            self.assertIsNone(varname_cache.get(self.file, 'CountingHandler'))
+        self.assertFalse(os.path.isfile(self.index_path))
+
+    def test_unwritable_directory_is_skipped(self):
+        with mock.patch.object(varname_cache.os, 'replace',
+                               side_effect=PermissionError('read-only')):
+            handler = CountingHandler(self.file, self.var_names)
+            self.assertListEqual(handler.var_names, self.var_names)
+            varname_cache.flush()
+        self.assertListEqual(os.listdir(self.tmp_dir), ['file.nc'])
+        self._clear_memory()
+        new_handler = CountingHandler(self.file, self.var_names)
+        self.assertListEqual(new_handler.var_names, self.var_names)
+        self.assertEqual(new_handler.scans, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
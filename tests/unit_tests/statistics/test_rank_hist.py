@@ -0,0 +1,118 @@
+#!/bin/env python
+# -*- coding: utf-8 -*-
+#
+#Created on 14.10.26
+#
+#Created for pymepps
+#
+#@author: Tobias Sebastian Finn, tobias.sebastian.finn@studium.uni-hamburg.de
+#
+#    Copyright (C) {2026}  {Tobias Sebastian Finn}
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# System modules
+import unittest
+import logging
+from unittest import mock
+
+# External modules
+import numpy as np
+import pandas as pd
+
+# Internal modules
+import pymepps.statistics.rank_hist as rank_hist
+try:
+    import pymepps.statistics._rank_numba as rank_numba
+except ImportError:
+    rank_numba = None
+
+
+logging.basicConfig(level=logging.DEBUG)
+
+
+class TestRankHist(unittest.TestCase):
+    def setUp(self):
+        index = pd.date_range('2026-10-14', periods=5, freq='H')
+        self.ens_ts = pd.DataFrame(
+            np.array([[0., 1., 2.],
+                      [3., 4., 5.],
+                      [6., 7., 8.],
+                      [9., 10., 11.],
+                      [12., 13., 14.]]),
+            index=index)
+        self.truth_ts = pd.Series([1.5, np.nan, 5.5, -1., 100.], index=index)
+
+    def _paths(self):
+        """
+        Patch the kernel threshold, such that the kernel and the numpy path
+        are both used for the small test ensemble.
+        """
+        paths = [('numpy', mock.patch.object(rank_hist, 'count_lower', None))]
+        if rank_numba is not None:
+            paths.append(
+                ('kernel', mock.patch.object(rank_numba, 'MIN_VALUES', 1)))
+        return paths
+
+    def test_rank_hist_counts_lower_members(self):
+        for name, patch in self._paths():
+            with self.subTest(path=name), patch:
+                rank_ts = rank_hist.rank_hist(self.ens_ts, self.truth_ts)
+                np.testing.assert_equal(rank_ts.values,
+                                        [2., np.nan, 0., 0., 3.])
+                pd.testing.assert_index_equal(rank_ts.index,
+                                              self.ens_ts.index)
+
+    def test_rank_hist_nan_truth_returns_nan(self):
+        truth_ts = self.truth_ts.iloc[[0, 2, 4]]
+        for name, patch in self._paths():
+            with self.subTest(path=name), patch:
+                rank_ts = rank_hist.rank_hist(self.ens_ts, truth_ts)
+                self.assertTrue(np.isnan(rank_ts.values[[1, 3]]).all())
+                self.assertFalse(np.isnan(rank_ts.values[[0, 2, 4]]).any())
+
+    @unittest.skipIf(rank_numba is None, 'numba is not installed')
+    def test_rank_hist_uses_kernel_above_threshold(self):
+        with mock.patch.object(rank_numba, 'MIN_VALUES', 1), \
+                mock.patch.object(rank_hist, 'count_lower',
+                                  wraps=rank_hist.count_lower) as count:
+            rank_hist.rank_hist(self.ens_ts, self.truth_ts)
+        self.assertTrue(count.called)
+
+    def test_rank_hist_wo_bias_removes_bias(self):
+        # The ensemble mean is shifted by 10 against the truth
+        truth_ts = self.ens_ts.iloc[:, 1] - 10.
+        bias_ens_ts = self.ens_ts.copy()
+        for name, patch in self._paths():
+            with self.subTest(path=name), patch:
+                rank_ts = rank_hist.rank_hist_wo_bias(bias_ens_ts, truth_ts)
+                np.testing.assert_equal(rank_ts.values, np.ones(5))
+                biased_ts = rank_hist.rank_hist(bias_ens_ts, truth_ts)
+                np.testing.assert_equal(biased_ts.values, np.zeros(5))
+                pd.testing.assert_frame_equal(bias_ens_ts, self.ens_ts)
+
+    def test_rank_hist_wo_bias_skips_missing_values(self):
+        truth_ts = self.ens_ts.iloc[:, 1] - 10.
+        truth_ts.iloc[2] = np.nan
+        ens_ts = self.ens_ts.copy()
+        ens_ts.iloc[3] = np.nan
+        for name, patch in self._paths():
+            with self.subTest(path=name), patch:
+                rank_ts = rank_hist.rank_hist_wo_bias(ens_ts, truth_ts)
+                np.testing.assert_equal(rank_ts.values,
+                                        [1., 1., np.nan, 0., 1.])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,138 @@
+#!/bin/env python
+# -*- coding: utf-8 -*-
+#
+#Created on 14.10.26
+#
+#Created for pymepps
+#
+#@author: Tobias Sebastian Finn, tobias.sebastian.finn@studium.uni-hamburg.de
+#
+#    Copyright (C) {2026}  {Tobias Sebastian Finn}
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# System modules
+import os
+import unittest
+import logging
+import tempfile
+import shutil
+from unittest import mock
+
+# External modules
+
+# Internal modules
+import pymepps.utilities.cdo_funcs as cdo_funcs
+
+
+logging.basicConfig(level=logging.DEBUG)
+
+
+class DummyHandler(object):
+    def __init__(self, file_path):
+        self.file = file_path
+
+
+class DummyDataset(object):
+    def __init__(self, file_handlers):
+        self.file_handlers = file_handlers
+
+
+class TestCdoFuncs(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.files = []
+        for i in range(4):
+            file_path = os.path.join(self.tmp_dir, 'file_{0:d}'.format(i))
+            open(file_path, 'w').close()
+            self.files.append(file_path)
+        # The second and the last file are already processed
+        for i in (1, 3):
+            open('{0:s}_sliced'.format(self.files[i]), 'w').close()
+        self.file_handlers = [DummyHandler(f) for f in self.files]
+        self.ds = DummyDataset(self.file_handlers)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_cdo_options_joins_threads_and_options(self):
+        self.assertEqual(cdo_funcs._cdo_options(), '')
+        self.assertEqual(cdo_funcs._cdo_options(cdo_threads=1), '')
+        self.assertEqual(cdo_funcs._cdo_options('-f nc', cdo_threads=4),
+                         '-P 4 -f nc')
+
+    def test_cdo_output_returns_dataset_without_output_file(self):
+        self.assertDictEqual(
+            cdo_funcs._cdo_output('out.nc', '-P 2'),
+            dict(output='out.nc', options='-P 2'))
+        self.assertDictEqual(
+            cdo_funcs._cdo_output(None, '-P 2'),
+            dict(returnXDataset=True, options='-f nc -P 2'))
+        self.assertDictEqual(
+            cdo_funcs._cdo_output(None, '-f grb'),
+            dict(returnXDataset=True, options='-f grb'))
+
+    def test_split_file_handlers_keeps_order(self):
+        tasks, new_file_handlers = cdo_funcs._split_file_handlers(
+            self.file_handlers)
+        self.assertListEqual(
+            [task[0] for task in tasks],
+            [self.file_handlers[0], self.file_handlers[2]])
+        self.assertListEqual(
+            [task[2] for task in tasks],
+            ['{0:s}_sliced'.format(self.files[i]) for i in (0, 2)])
+        self.assertListEqual(
+            new_file_handlers,
+            [None, self.file_handlers[1], None, self.file_handlers[3]])
+
+    def test_split_file_handlers_pipes_all_handlers(self):
+        tasks, new_file_handlers = cdo_funcs._split_file_handlers(
+            self.file_handlers, pipe=True)
+        self.assertListEqual([task[0] for task in tasks],
+                             self.file_handlers)
+        self.assertTrue(all(task[2] is None for task in tasks))
+        self.assertListEqual(new_file_handlers, [None] * 4)
+
+    def test_split_file_handlers_skips_inplace(self):
+        tasks, new_file_handlers = cdo_funcs._split_file_handlers(
+            self.file_handlers, inplace=True, pipe=True)
+        self.assertListEqual(tasks, [])
+        self.assertListEqual(new_file_handlers, self.file_handlers)
+
+    def test_sellonlatbox_keeps_order(self):
+        cdo = mock.Mock()
+        with mock.patch.object(cdo_funcs, 'get_cdo', return_value=cdo):
+            new_file_handlers = cdo_funcs.sellonlatbox(
+                self.ds, [0, 10, 50, 60], cdo_threads=2)
+        self.assertEqual(cdo.sellonlatbox.call_count, 2)
+        _, kwargs = cdo.sellonlatbox.call_args
+        self.assertEqual(kwargs['options'], '-P 2')
+        self.assertListEqual(
+            [fh.file for fh in new_file_handlers],
+            ['{0:s}_sliced'.format(self.files[0]), self.files[1],
+             '{0:s}_sliced'.format(self.files[2]), self.files[3]])
+
+    def test_selnearest_keeps_order(self):
+        cdo = mock.Mock()
+        with mock.patch.object(cdo_funcs, 'get_cdo', return_value=cdo):
+            new_file_handlers = cdo_funcs.selnearest(self.ds, (10, 53.5))
+        self.assertEqual(cdo.remapnn.call_count, 2)
+        self.assertListEqual(
+            [fh.file for fh in new_file_handlers],
+            ['{0:s}_sliced'.format(self.files[0]), self.files[1],
+             '{0:s}_sliced'.format(self.files[2]), self.files[3]])
+
+
+if __name__ == '__main__':
+    unittest.main()